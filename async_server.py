@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from wire_protocol import FrameError, read_frame, write_frame
+
+
+class AsyncBotServer:
+    """ Shared asyncio server core for every bot
+
+    Subclasses set `self.host`, `self.port` and `self.running`, implement
+    `handle_message(message) -> response` and start `_server_loop` in a thread.
+    Handlers run on a bounded thread pool so blocking work (HTTP fetches, file
+    writes, locks) never stalls the event loop.
+    """
+
+    max_connections = 512       # Open connections served at once; extra clients wait in the accept backlog
+    max_pending_requests = 64   # Requests queued or running in the executor before reads pause
+    max_workers = 16            # Executor threads for handle_message
+    idle_timeout = 60.0         # Close keep-alive connections idle longer than this (pool drops at 30s)
+    request_timeout = 30.0      # Reply with an error if a handler takes longer than this
+    listen_backlog = 128
+    inline_commands = ()        # Prefixes cheap enough to run directly on the event loop
+    max_inline_size = 4096      # Longer requests go to the executor even if their prefix is inline
+
+    def handle_message(self, message):
+        """ Processes one request and returns the response text """
+        raise NotImplementedError
+
+    # ========================== EVENT LOOP ==========================
+    def _server_loop(self):
+        """ Runs the asyncio server until the bot is stopped """
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            print(f"❌ Server Error: {e}")
+
+    async def _serve(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=type(self).__name__)
+        self._connection_slots = asyncio.Semaphore(self.max_connections)
+        self._request_slots = asyncio.Semaphore(self.max_pending_requests)
+        self._writers = set()
+        server = await asyncio.start_server(
+            self._on_connection, self.host, self.port, backlog=self.listen_backlog, reuse_address=True
+        )
+        try:
+            async with server:
+                while self.running:
+                    await asyncio.sleep(0.5)
+                # Closing the transports lets every connection task see EOF and finish cleanly
+                for writer in list(self._writers):
+                    writer.close()
+                await asyncio.sleep(0.1)
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _on_connection(self, reader, writer):
+        """ Serves framed requests on one keep-alive connection """
+        async with self._connection_slots:
+            self._writers.add(writer)
+            try:
+                while self.running:
+                    message = await asyncio.wait_for(read_frame(reader), self.idle_timeout)
+                    if message is None:
+                        break  # Client closed the keep-alive connection
+                    response = await self._dispatch(message.strip())
+                    await write_frame(writer, response)
+            except asyncio.TimeoutError:
+                pass  # Idle connection reaped
+            except (ConnectionError, FrameError) as e:
+                print(f"⚠️ Connection Error: {e}")
+            finally:
+                self._writers.discard(writer)
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def _dispatch(self, message):
+        """ Runs the handler inline or on the executor, bounded by the request slots """
+        if self.inline_commands and len(message) <= self.max_inline_size and message.startswith(self.inline_commands):
+            return self._safe_handle(message)
+        async with self._request_slots:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._safe_handle, message)
+            try:
+                return await asyncio.wait_for(future, self.request_timeout)
+            except asyncio.TimeoutError:
+                return f"⏳ Request timed out after {self.request_timeout}s."
+
+    def _safe_handle(self, message):
+        try:
+            return self.handle_message(message)
+        except Exception as e:
+            return f"❌ Error processing request: {e}"
@@ -1,9 +1,9 @@
-import socket
 import random
 import threading
-import time
+from connection_pool import default_pool
+from async_server import AsyncBotServer
 
-class AttentionAI:
+class AttentionAI(AsyncBotServer):
     def __init__(self, host='localhost', port=7086):  # Fixed Port
         self.host = host
         self.port = port
@@ -54,11 +54,7 @@ class AttentionAI:
 
         target_port = self.neural_bots[target_bot]
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect(("localhost", target_port))
-                s.sendall(message.encode())
-                response = s.recv(1024).decode()
-                return response
+            return default_pool.request("localhost", target_port, message)
         except Exception as e:
             return f"❌ Error communicating with {target_bot}: {e}"
 
@@ -70,22 +66,9 @@ class AttentionAI:
         server_thread = threading.Thread(target=self._server_loop, daemon=True)
         server_thread.start()
 
-    def _server_loop(self):
-        """ Handles incoming connections and processes market data requests """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    with conn:
-                        message = conn.recv(1024).decode().strip()
-                        if message:
-                            response = self.generate_market_data(message)
-                            conn.sendall(response.encode())
-                except Exception as e:
-                    print(f"❌ Error in server loop: {e}")
-                    time.sleep(1)
+    def handle_message(self, message):
+        """ Processes market data requests """
+        return self.generate_market_data(message)
 
     def stop(self):
         """ Gracefully stops the Market Data AI """
@@ -5,9 +5,12 @@ import os
 import threading
 import subprocess
 from datetime import datetime
+from connection_pool import default_pool
+from security_gate import SecurityGate
+from task_scheduler import TaskScheduler
 
 class UltimateBrainAI:
-    def __init__(self):
+    def __init__(self, num_workers=6):
         self.host = 'localhost'
         self.port = 7070
         self.memory = []
@@ -28,7 +31,9 @@ class UltimateBrainAI:
             "attention_ai": ("localhost", 7086),  # Fixed
             "network_ai": ("localhost", 7087)  # Fixed
         }
-        self.task_queue = []
+        self.memory_lock = threading.Lock()
+        self.gate = SecurityGate(security_ai=self.neural_bots["security_ai"])  # Vets BOT: and TASK: payloads
+        self.scheduler = TaskScheduler(self.process_task, num_workers=num_workers)
         self.load_memory()
         self.start_multi_threading()
 
@@ -43,24 +48,29 @@ class UltimateBrainAI:
         """ Store memory in the system """
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         entry = {"timestamp": timestamp, "message": message}
-        self.memory.append(entry)
-        with open("memory_data.json", "w") as file:
-            json.dump(self.memory, file)
+        with self.memory_lock:  # Task workers finish concurrently
+            self.memory.append(entry)
+            with open("memory_data.json", "w") as file:
+                json.dump(self.memory, file)
 
     # ========================== TASK SYSTEM ==========================
     def start_multi_threading(self):
-        """ Start the threads that will handle various tasks """
-        num_threads = 6
-        for _ in range(num_threads):
-            thread = threading.Thread(target=self.task_worker, daemon=True)
-            thread.start()
-
-    def task_worker(self):
-        """ Handle AI tasks in the background """
-        while self.running:
-            if self.task_queue:
-                task = self.task_queue.pop(0)
-                self.process_task(task)
+        """ Start the scheduler workers that will handle various tasks """
+        self.scheduler.start()
+
+    def submit_task(self, spec):
+        """ Queues a task given as `[priority=N:][deadline=SECONDS:]payload` """
+        priority, deadline = 5, None
+        parts = spec.split(":")
+        while len(parts) > 1 and parts[0].strip().startswith(("priority=", "deadline=")):
+            key, value = parts.pop(0).strip().split("=", 1)
+            if key == "priority":
+                priority = int(value)
+            else:
+                deadline = float(value)
+        task = ":".join(parts).strip()
+        task_id = self.scheduler.submit(task, priority=priority, deadline=deadline)
+        return f"⚙️ Task added: {task} (ID: {task_id}, Priority: {priority})"
 
     def process_task(self, task):
         """ Assign AI tasks to appropriate bots """
@@ -74,6 +84,7 @@ class UltimateBrainAI:
             response = "⚠️ Task format not recognized."
 
         self.save_memory(f"Task Processed: {task} -> Response: {response}")
+        return response
 
     # ========================== COMMUNICATION SYSTEM ==========================
     def communicate_with_bot(self, bot_name, message):
@@ -81,14 +92,18 @@ class UltimateBrainAI:
         if bot_name in self.neural_bots:
             host, port = self.neural_bots[bot_name]
             try:
-                with socket.create_connection((host, port), timeout=2) as s:
-                    s.sendall(message.encode())
-                    response = s.recv(1024).decode()
-                    return response
+                return default_pool.request(host, port, message, timeout=2)
             except Exception as e:
                 return f"❌ Error communicating with {bot_name}: {e}"
         return "⚠️ Invalid bot name."
 
+    def gate_check(self, payload):
+        """ Returns a refusal message if the security gate blocks the payload, else None """
+        verdict = self.gate.check(payload)
+        if verdict["allowed"]:
+            return None
+        return f"🛑 Blocked by security gate ({verdict['severity']}): {', '.join(verdict['rules'])}"
+
     def check_bot_status(self):
         """ Checks the status of all bots """
         status = {}
@@ -104,14 +119,32 @@ class UltimateBrainAI:
         """ Executes commands directed to AI Brain """
         if command.startswith("STATUS"):
             return self.check_bot_status()
+        elif command.startswith("TASK_RESULT"):
+            task_id = command.replace("TASK_RESULT:", "").strip()
+            result = self.scheduler.result(int(task_id)) if task_id.isdigit() else None
+            return result or f"⚠️ Task {task_id} not found."
+        elif command.startswith("TASK_CANCEL"):
+            task_id = command.replace("TASK_CANCEL:", "").strip()
+            if task_id.isdigit() and self.scheduler.cancel(int(task_id)):
+                return f"🛑 Task {task_id} cancelled."
+            return f"⚠️ Task {task_id} is not queued."
+        elif command.startswith("TASK_STATS"):
+            return self.scheduler.metrics()
+        elif command.startswith("GATE_STATS"):
+            return self.gate.stats()
         elif command.startswith("TASK"):
-            task = command.replace("TASK:", "").strip()
-            self.task_queue.append(task)
-            return f"⚙️ Task added: {task}"
+            spec = command.replace("TASK:", "", 1)
+            blocked = self.gate_check(spec)
+            if blocked:
+                return blocked
+            try:
+                return self.submit_task(spec)
+            except ValueError:
+                return "⚠️ Invalid TASK format. Use TASK:[priority=N:][deadline=SECONDS:]task"
         elif command.startswith("BOT"):
             parts = command.split(":")
             if len(parts) == 3:
-                return self.communicate_with_bot(parts[1], parts[2])
+                return self.gate_check(parts[2]) or self.communicate_with_bot(parts[1], parts[2])
             else:
                 return "⚠️ Invalid BOT command format."
         elif command.startswith("RECALL"):
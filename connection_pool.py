@@ -0,0 +1,117 @@
+import socket
+import select
+import threading
+import time
+from collections import deque
+from wire_protocol import FrameError, recv_frame, send_frame
+
+
+class ConnectionPool:
+    """ Keeps idle keep-alive connections per target bot and reuses them for framed requests """
+
+    def __init__(self, max_idle_per_target=8, idle_timeout=30.0, connect_timeout=5.0):
+        self.max_idle_per_target = max_idle_per_target
+        self.idle_timeout = idle_timeout  # Drop idle connections before the server does
+        self.connect_timeout = connect_timeout
+        self._idle = {}  # (host, port) -> deque of (socket, last_used)
+        self._lock = threading.Lock()
+        self.stats = {"connects": 0, "reuses": 0, "reconnects": 0, "discarded": 0}
+
+    # ========================== CONNECTION LIFECYCLE ==========================
+    def _is_healthy(self, sock, last_used):
+        """ An idle connection is usable if it is fresh and the peer has not closed it """
+        if time.monotonic() - last_used > self.idle_timeout:
+            return False
+        try:
+            # A readable idle socket means EOF or stray bytes: either way it is out of sync
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        return not readable
+
+    def _connect(self, target):
+        sock = socket.create_connection(target, timeout=self.connect_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self.stats["connects"] += 1
+        return sock
+
+    def _acquire(self, target):
+        """ Returns (socket, reused) using the most recently released healthy connection """
+        while True:
+            with self._lock:
+                idle = self._idle.get(target)
+                if not idle:
+                    break
+                sock, last_used = idle.pop()
+            if self._is_healthy(sock, last_used):
+                with self._lock:
+                    self.stats["reuses"] += 1
+                return sock, True
+            self._discard(sock)
+        return self._connect(target), False
+
+    def _release(self, target, sock):
+        with self._lock:
+            idle = self._idle.setdefault(target, deque())
+            if len(idle) < self.max_idle_per_target:
+                idle.append((sock, time.monotonic()))
+                return
+        self._discard(sock)
+
+    def _discard(self, sock):
+        with self._lock:
+            self.stats["discarded"] += 1
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+    # ========================== REQUESTS ==========================
+    def request(self, host, port, message, timeout=None):
+        """ Sends one framed request over a pooled connection and returns the framed reply """
+        target = (host, port)
+        while True:
+            sock, reused = self._acquire(target)
+            sent = False
+            try:
+                sock.settimeout(timeout)
+                send_frame(sock, message)
+                sent = True
+                response = recv_frame(sock)
+            except socket.timeout:
+                # The request may still be running remotely, so never replay it
+                self._discard(sock)
+                raise
+            except (OSError, FrameError):
+                self._discard(sock)
+                if reused and not sent:
+                    # Stale keep-alive connection that refused the request: retry on a fresh one
+                    self._count_reconnect()
+                    continue
+                raise
+            if response is None:
+                self._discard(sock)
+                if reused:
+                    # Closed before a byte came back: a keep-alive connection the server had already dropped
+                    self._count_reconnect()
+                    continue
+                raise FrameError(f"{host}:{port} closed the connection without replying.")
+            self._release(target, sock)
+            return response
+
+    def _count_reconnect(self):
+        with self._lock:
+            self.stats["reconnects"] += 1
+
+    def close_all(self):
+        """ Closes every idle connection """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for sock, _ in connections:
+                self._discard(sock)
+
+
+# Shared by every bot's outbound path so connections are reused process-wide
+default_pool = ConnectionPool()
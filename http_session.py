@@ -0,0 +1,22 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (3.05, 10)  # (connect, read) seconds for upstream API calls
+
+
+def make_session(pool_size=10, retries=2):
+    """ Returns a requests.Session that keeps connections alive across calls
+
+    Reusing the session skips DNS, TCP and TLS setup on every fetch after the
+    first. `pool_size` should cover the number of threads sharing the session.
+    Idempotent GETs are retried with backoff on connection errors, 429 and 5xx.
+    Sessions do not apply a default timeout: pass DEFAULT_TIMEOUT per call.
+    """
+    retry = Retry(total=retries, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset({"GET"}), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -10,6 +10,7 @@ import os
 import threading
 import subprocess
 from datetime import datetime
+from connection_pool import default_pool
 
 class UltimateBrainAI:
     """
@@ -103,10 +104,7 @@ class UltimateBrainAI:
         if bot_name in self.neural_bots:
             host, port = self.neural_bots[bot_name]
             try:
-                with socket.create_connection((host, port), timeout=2) as s:
-                    s.sendall(message.encode())
-                    response = s.recv(1024).decode()
-                    return response
+                return default_pool.request(host, port, message, timeout=2)
             except Exception as e:
                 return f"Error communicating with {bot_name}: {e}"
 
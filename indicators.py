@@ -0,0 +1,161 @@
+import threading
+import numpy as np
+
+
+class IndicatorEngine:
+    """ Incremental technical indicators for many symbols at once
+
+    Each symbol owns one row in a set of NumPy state arrays. A batch of ticks
+    (one per symbol) updates every affected row in a single vectorized step,
+    in O(1) per symbol:
+
+    - SMA and Bollinger bands from running sums over a ring of the last
+      `window` prices (sums are recomputed from the ring on each wrap so
+      floating-point drift cannot build up)
+    - fast/slow EMAs, MACD and its signal line by exponential smoothing
+    - RSI with Wilder's smoothing, seeded by the mean of the first `rsi_period` moves
+    - VWAP over the trading session, derived from the quote's cumulative day
+      volume; a drop in that volume marks a new session
+
+    Nothing is ever recomputed from the full history.
+    """
+
+    def __init__(self, window=20, fast=12, slow=26, signal=9, rsi_period=14, band_width=2.0, capacity=1024):
+        self.window = window
+        self.rsi_period = rsi_period
+        self.band_width = band_width
+        self.alphas = (2 / (fast + 1), 2 / (slow + 1), 2 / (signal + 1))
+        self.rows = {}  # symbol -> row in the state arrays
+        self.lock = threading.Lock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.ring = np.zeros((capacity, self.window))
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.window_sum = np.zeros(capacity)
+        self.window_sumsq = np.zeros(capacity)
+        self.ema_fast = np.zeros(capacity)
+        self.ema_slow = np.zeros(capacity)
+        self.macd_signal = np.zeros(capacity)
+        self.avg_gain = np.zeros(capacity)
+        self.avg_loss = np.zeros(capacity)
+        self.session_pv = np.zeros(capacity)
+        self.session_volume = np.zeros(capacity)
+        self.last_price = np.zeros(capacity)
+        self.last_volume = np.zeros(capacity)
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in ("ring", "count", "window_sum", "window_sumsq", "ema_fast", "ema_slow",
+                                                      "macd_signal", "avg_gain", "avg_loss", "session_pv",
+                                                      "session_volume", "last_price", "last_volume")}
+        self._allocate(self.capacity * 2)
+        for name, array in old.items():
+            getattr(self, name)[:len(array)] = array
+
+    def tracked(self, symbol):
+        return symbol in self.rows
+
+    def _rows(self, symbols):
+        for symbol in symbols:
+            if symbol not in self.rows:
+                if len(self.rows) == self.capacity:
+                    self._grow()
+                self.rows[symbol] = len(self.rows)
+        return np.fromiter((self.rows[s] for s in symbols), dtype=np.int64, count=len(symbols))
+
+    # ========================== UPDATES ==========================
+    def update(self, symbols, prices, volumes):
+        """ Applies one new tick per symbol (symbols must be unique within a call) """
+        with self.lock:
+            self._update_rows(self._rows(symbols), np.asarray(prices, dtype=float), np.asarray(volumes, dtype=float))
+
+    def warm(self, symbols, price_series, volume_series):
+        """ Replays recent history for symbols, vectorized across symbols one time step at a time """
+        if not symbols:
+            return
+        length = max(len(series) for series in price_series)
+        prices = np.full((len(symbols), length), np.nan)
+        volumes = np.zeros((len(symbols), length))
+        for i, (p, v) in enumerate(zip(price_series, volume_series)):
+            if len(p):
+                prices[i, length - len(p):] = p  # Right-aligned so every symbol ends on its latest tick
+                volumes[i, length - len(v):] = v
+        with self.lock:
+            rows = self._rows(symbols)
+            self.count[rows] = 0
+            for t in range(length):
+                present = ~np.isnan(prices[:, t])
+                self._update_rows(rows[present], prices[present, t], volumes[present, t])
+
+    def _update_rows(self, rows, price, volume):
+        count = self.count[rows]
+        first = count == 0
+
+        # Rolling window for SMA / Bollinger
+        slot = count % self.window
+        dropped = np.where(count >= self.window, self.ring[rows, slot], 0.0)
+        self.ring[rows, slot] = price
+        self.window_sum[rows] += price - dropped
+        self.window_sumsq[rows] += price * price - dropped * dropped
+        self.window_sum[rows[first]] = price[first]
+        self.window_sumsq[rows[first]] = price[first] ** 2
+        wrapped = rows[slot == self.window - 1]
+        self.window_sum[wrapped] = self.ring[wrapped].sum(axis=1)
+        self.window_sumsq[wrapped] = (self.ring[wrapped] ** 2).sum(axis=1)
+
+        # EMAs and MACD, seeded with the first price
+        fast, slow, signal = self.alphas
+        self.ema_fast[rows] = np.where(first, price, self.ema_fast[rows] + fast * (price - self.ema_fast[rows]))
+        self.ema_slow[rows] = np.where(first, price, self.ema_slow[rows] + slow * (price - self.ema_slow[rows]))
+        macd = self.ema_fast[rows] - self.ema_slow[rows]
+        self.macd_signal[rows] = np.where(first, macd, self.macd_signal[rows] + signal * (macd - self.macd_signal[rows]))
+
+        # RSI: running mean of the first rsi_period moves, then Wilder's smoothing
+        move = np.where(first, 0.0, price - self.last_price[rows])
+        divisor = np.minimum(np.maximum(count, 1), self.rsi_period)
+        self.avg_gain[rows] = np.where(first, 0.0, self.avg_gain[rows] + (np.maximum(move, 0) - self.avg_gain[rows]) / divisor)
+        self.avg_loss[rows] = np.where(first, 0.0, self.avg_loss[rows] + (np.maximum(-move, 0) - self.avg_loss[rows]) / divisor)
+
+        # Session VWAP from cumulative day volume
+        new_session = first | (volume < self.last_volume[rows])
+        traded = np.where(new_session, volume, volume - self.last_volume[rows])
+        self.session_pv[rows] = np.where(new_session, 0.0, self.session_pv[rows]) + price * traded
+        self.session_volume[rows] = np.where(new_session, 0.0, self.session_volume[rows]) + traded
+
+        self.last_price[rows] = price
+        self.last_volume[rows] = volume
+        self.count[rows] = count + 1
+
+    # ========================== READS ==========================
+    def values(self, symbols):
+        """ Returns {indicator: array aligned with symbols}; untracked symbols get NaN """
+        with self.lock:
+            known = np.array([s in self.rows for s in symbols], dtype=bool)
+            rows = np.array([self.rows.get(s, 0) for s in symbols], dtype=np.int64)
+            count = self.count[rows].astype(float)
+            n = np.minimum(count, self.window)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sma = self.window_sum[rows] / n
+                std = np.sqrt(np.maximum(self.window_sumsq[rows] / n - sma ** 2, 0.0))
+                gain, loss = self.avg_gain[rows], self.avg_loss[rows]
+                rsi = np.where(loss > 0, 100 - 100 / (1 + gain / loss), np.where(gain > 0, 100.0, 50.0))
+                vwap = np.where(self.session_volume[rows] > 0, self.session_pv[rows] / self.session_volume[rows], np.nan)
+            macd = self.ema_fast[rows] - self.ema_slow[rows]
+            result = {
+                "samples": count,
+                "price": self.last_price[rows].copy(),
+                "sma": sma,
+                "ema_fast": self.ema_fast[rows],
+                "ema_slow": self.ema_slow[rows],
+                "macd": macd,
+                "macd_signal": self.macd_signal[rows],
+                "macd_histogram": macd - self.macd_signal[rows],
+                "rsi": np.where(count > 1, rsi, np.nan),
+                "bollinger_upper": sma + self.band_width * std,
+                "bollinger_lower": sma - self.band_width * std,
+                "vwap": vwap,
+            }
+        for name, array in result.items():
+            array[~known] = np.nan
+        return result
@@ -1,11 +1,11 @@
-import socket
 import json
 import os
 import threading
 from datetime import datetime
 import openai  # Using GPT for advanced language processing
+from async_server import AsyncBotServer
 
-class LinguisticAI:
+class LinguisticAI(AsyncBotServer):
     def __init__(self, host='localhost', port=7085):
         self.host = host
         self.port = port
@@ -94,35 +94,17 @@ class LinguisticAI:
         server_thread.start()
         print("\n📚 Linguistic AI is Active and THINKING...")
 
-    def _server_loop(self):
-        """ Handles incoming requests via sockets """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                    thread.start()
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
-    def handle_connection(self, conn):
+    def handle_message(self, message):
         """ Processes incoming chat messages """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                if message.startswith("THINKER"):
-                    response = self.literary_analysis(message.replace("THINKER:", "").strip())
-                elif message.startswith("MEMORY"):
-                    response = self.recall_memory()
-                elif message.startswith("GPT"):
-                    response = self.gpt_analysis(message.replace("GPT:", "").strip())
-                else:
-                    response = self.literary_analysis(message)
-                conn.sendall(response.encode())
-        except Exception as e:
-            print(f"⚠️ Connection Error: {e}")
+        if message.startswith("THINKER"):
+            response = self.literary_analysis(message.replace("THINKER:", "").strip())
+        elif message.startswith("MEMORY"):
+            response = self.recall_memory()
+        elif message.startswith("GPT"):
+            response = self.gpt_analysis(message.replace("GPT:", "").strip())
+        else:
+            response = self.literary_analysis(message)
+        return response
 
     def stop(self):
         """ Gracefully stops the Linguistic AI """
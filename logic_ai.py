@@ -1,5 +1,3 @@
-import socket
-import re
 import json
 import os
 import threading
@@ -7,8 +5,11 @@ import time
 import random
 import numpy as np
 from datetime import datetime
+from async_server import AsyncBotServer
+from logic_engine import LogicEngine
+from response_cache import ResponseCache
 
-class LogicAI:
+class LogicAI(AsyncBotServer):
     def __init__(self, host='localhost', port=7078):
         self.host = host
         self.port = port
@@ -16,7 +17,8 @@ class LogicAI:
         self.load_memory()
         self.lock = threading.Lock()
         self.running = True
-        self.logic_scores = {}  # Confidence levels for logic analysis
+        self.results = ResponseCache(max_entries=10000, ttl=3600.0)  # Analyses by normalized message
+        self.engine = LogicEngine()  # Cue patterns compiled once for every message
 
         # ✅ Updated Neural Bots Port Mapping
         self.neural_bots = {
@@ -45,21 +47,29 @@ class LogicAI:
     def save_memory(self):
         """ Saves logic memory to a file """
         with self.lock:
-            with open(self.memory_file, "w") as file:
-                json.dump(self.memory, file)
+            self._write_memory()
+
+    def _write_memory(self):
+        """ Writes the memory file; the caller holds self.lock """
+        with open(self.memory_file, "w") as file:
+            json.dump(self.memory, file)
 
     def remember_logic(self, message, result, confidence):
         """ Stores logical interpretations persistently with confidence level """
+        self.remember_many([(message, result, confidence)])
+
+    def remember_many(self, analyses):
+        """ Stores (message, result, confidence) analyses with a single write of the memory file """
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = {
+        entries = [{
             "timestamp": timestamp,
             "input": message,
             "logic_analysis": result,
             "confidence": round(confidence, 2)
-        }
+        } for message, result, confidence in analyses]
         with self.lock:
-            self.memory.append(entry)
-            self.save_memory()
+            self.memory.extend(entries)
+            self._write_memory()
 
     def recall_logic(self, num_entries=10):
         """ Retrieves last X logical conclusions """
@@ -73,32 +83,43 @@ class LogicAI:
     def process_logic(self, message):
         """ Dynamically analyzes logical structures and assigns confidence scores """
         message = message.lower()
-        response = ""
-        logic_score = 1.0  # Default confidence score
-
-        # **Logical Constructs Detection**
-        logic_patterns = {
-            "negation": ("not" in message and ("true" in message or "false" in message), "❓ Possible Logical Paradox Detected.", -0.2),
-            "contradiction": (re.search(r"\b(true)\b.*\b(false)\b|\b(false)\b.*\b(true)\b", message), "⚠️ Contradiction Identified!", -0.4),
-            "deduction": ("therefore" in message or "thus" in message, "🔗 Logical Deduction Recognized.", 0.2),
-            "conflict": ("but" in message, "🧐 Possible Logical Conflict.", -0.1),
-            "temporal": ("will happen" in message or "in the future" in message, "⏳ Temporal Prediction Detected.", 0.1),
-            "probability": ("probably" in message or "most likely" in message, "📊 Probability-Based Reasoning Detected.", 0.1)
-        }
-
-        for key, (condition, msg, score) in logic_patterns.items():
-            if condition:
-                response += msg + "\n"
-                logic_score += score
-
-        # Default if no logic detected
-        if not response:
-            response = "Logic AI: No significant logical pattern found."
-
-        # Store logic analysis
-        self.remember_logic(message, response, logic_score)
-        self.logic_scores[message] = logic_score
-        return response
+        result, fresh = self.analyze_cached(message)
+
+        # Store logic analysis (a repeated message was stored when it was first analyzed)
+        if fresh:
+            self.remember_logic(message, result["response"], result["score"])
+        return result["response"]
+
+    def analyze_cached(self, message):
+        """ Returns (analysis, fresh); repeats of a message within the TTL reuse its cached analysis """
+        key = " ".join(message.split())
+        fresh = []
+
+        def analyze():
+            fresh.append(True)
+            return self.engine.analyze(key)
+
+        return self.results.get_or_load(key, analyze), bool(fresh)
+
+    def process_batch(self, payload):
+        """ Analyzes many statements per request: a JSON array of strings, or one statement per line """
+        try:
+            statements = json.loads(payload) if payload.startswith("[") else [line for line in payload.splitlines() if line.strip()]
+        except ValueError as e:
+            return f"⚠️ Invalid PROCESS_BATCH payload: {e}"
+        if not statements or not all(isinstance(statement, str) for statement in statements):
+            return "⚠️ PROCESS_BATCH needs one or more statements."
+        results, analyses = [], []
+        for statement in statements:
+            message = statement.lower()
+            result, fresh = self.analyze_cached(message)
+            results.append(result)
+            if fresh:
+                analyses.append((message, result["response"], result["score"]))
+        if analyses:
+            self.remember_many(analyses)
+        return json.dumps([{"constructs": result["constructs"], "score": round(result["score"], 2),
+                            "response": result["response"]} for result in results])
 
     # ========================== LOGIC AI SERVER ==========================
     def start(self):
@@ -107,23 +128,15 @@ class LogicAI:
         server_thread.start()
         print("\n🧠 Logic AI is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Handles incoming logic requests via sockets """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                conn, addr = s.accept()
-                thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                thread.start()
-
-    def handle_connection(self, conn):
-        """ Handles individual connections for logic processing """
-        with conn:
-            message = conn.recv(1024).decode()
-            if message:
-                response = self.process_logic(message)
-                conn.sendall(response.encode())
+    def handle_message(self, message):
+        """ Handles individual requests for logic processing """
+        if not message:
+            return "⚠️ Empty message."
+        if message == "STATS":
+            return json.dumps(self.results.stats(), indent=4)
+        if message.startswith("PROCESS_BATCH"):
+            return self.process_batch(message.replace("PROCESS_BATCH:", "", 1).strip())
+        return self.process_logic(message)
 
     def stop(self):
         """ Gracefully stops the Logic AI """
@@ -0,0 +1,59 @@
+import re
+
+# Cue words, each matched as whole words (a run of whitespace matches the space in a phrase)
+CUES = {
+    "not": ["not"],
+    "true": ["true"],
+    "false": ["false"],
+    "deduction": ["therefore", "thus"],
+    "conflict": ["but"],
+    "temporal": ["will happen", "in the future"],
+    "probability": ["probably", "most likely"],
+}
+
+# (construct, cues that must all appear, cues of which at least one must appear, message, score change)
+CONSTRUCTS = [
+    ("negation", ("not",), ("true", "false"), "❓ Possible Logical Paradox Detected.", -0.2),
+    ("contradiction", ("true", "false"), (), "⚠️ Contradiction Identified!", -0.4),
+    ("deduction", ("deduction",), (), "🔗 Logical Deduction Recognized.", 0.2),
+    ("conflict", ("conflict",), (), "🧐 Possible Logical Conflict.", -0.1),
+    ("temporal", ("temporal",), (), "⏳ Temporal Prediction Detected.", 0.1),
+    ("probability", ("probability",), (), "📊 Probability-Based Reasoning Detected.", 0.1),
+]
+
+
+class LogicEngine:
+    """ Logical construct detection in one pass over the message
+
+    Every cue word or phrase is compiled once into a single regex, each ending
+    in an empty marker group that names its cue. A scan collects the set of
+    cues present, and each construct is then a set test over those cues, so a
+    message costs one regex pass however many constructs there are. Each
+    branch starts with a literal character (the leading word boundary is a
+    lookbehind after it), which lets the regex engine skip straight to
+    candidate positions. Messages are expected in lowercase.
+    """
+
+    def __init__(self, cues=CUES, constructs=CONSTRUCTS, base_score=1.0):
+        self.constructs = constructs
+        self.base_score = base_score
+        self.markers = [None]  # Marker group number -> cue
+        branches = []
+        for cue, phrases in cues.items():
+            for phrase in phrases:
+                words = re.escape(phrase).replace(r"\ ", r"\s+")
+                branches.append(words[0] + r"(?<!\w.)" + words[1:] + r"\b()")
+                self.markers.append(cue)
+        self.pattern = re.compile("|".join(branches))
+
+    def analyze(self, message):
+        """ Returns {"constructs": names, "response": text, "score": confidence} for one message """
+        cues = {self.markers[match.lastindex] for match in self.pattern.finditer(message)}
+        found, lines, score = [], [], self.base_score
+        for name, required, any_of, text, change in self.constructs:
+            if cues.issuperset(required) and (not any_of or not cues.isdisjoint(any_of)):
+                found.append(name)
+                lines.append(text)
+                score += change
+        response = "\n".join(lines) + "\n" if lines else "Logic AI: No significant logical pattern found."
+        return {"constructs": found, "response": response, "score": score}
@@ -1,86 +1,329 @@
-import socket
+import gc
 import json
+import heapq
+import itertools
+import math
 import os
 import threading
 import time
-from datetime import datetime
-
-class MemoryAI:
-    def __init__(self, host='localhost', port=7073):
+import numpy as np
+from connection_pool import default_pool
+from memory_store import MemoryRecord, MemoryStore
+from memory_index import InvertedIndex
+from memory_segments import ColdTier
+from vector_index import HashedEmbedder, IVFIndex
+from async_server import AsyncBotServer
+
+class MemoryAI(AsyncBotServer):
+    def __init__(self, host='localhost', port=7073, memory_file="/workspace/ai_project/memory_data.json", capacity=1_000_000):
         self.host = host
         self.port = port
-        self.memory_file = "/workspace/ai_project/memory_data.json"
-        self.load_memory()
+        self.memory_file = memory_file
+        self.capacity = capacity  # Most memories kept; beyond it the lowest effective weight is evicted
+        self.compact_min_records = 10000  # Compact once the log outgrows both this and the live state
+        self.hot_entries = 20000  # Newest memories kept resident; older ones live in mmap'd cold segments
+        self.segment_entries = 20000  # Entries moved to cold storage per segment
+        self.decay_rate = 0.95  # Weight multiplier per decay interval
+        self.decay_interval = 300  # Seconds
+        self.prune_threshold = 0.1  # Memories whose effective weight falls to this are forgotten
+        self.decay_lambda = math.log(1 / self.decay_rate) / self.decay_interval
+        self.store = MemoryStore(self.memory_file)
+        self.index = InvertedIndex()
+        self.embedder = HashedEmbedder()
+        self.vectors = IVFIndex(dim=self.embedder.dim)
+        self.vector_file = os.path.splitext(self.memory_file)[0] + ".vectors.npz"
+        self.vectors_ready = False  # Vectors are reconciled in bulk after replay
+        self.cold = ColdTier(os.path.splitext(self.memory_file)[0] + ".segments", self.decay_lambda,
+                             nprobe=self.vectors.nprobe)
         self.lock = threading.Lock()
+        self.load_memory()
         self.running = True
 
     # ========================== MEMORY SYSTEM ==========================
     def load_memory(self):
-        """ Loads stored memory from a file """
-        if os.path.exists(self.memory_file):
-            with open(self.memory_file, "r") as file:
-                self.memory = json.load(file)
-        else:
-            self.memory = []
+        """ Rebuilds memory from the last snapshot plus the write-ahead log
+
+        Only the hot tier is read into RAM; cold segments are mapped from the
+        manifest in the snapshot header, so startup does not depend on history length.
+        """
+        entries, ops = self.store.load()
+        with self.lock:
+            self.memory = {}  # Hot tier: id -> entry, in insertion (recency) order
+            self.decay_heap = []  # (decay score, id) min-heap over hot entries; stale items are skipped lazily
+            self.index.clear()
+            self.cold.open(self.store.meta.get("cold", {}))
+            self.next_id = self.store.meta.get("next_id", 1)
+            for entry in entries:
+                self._add_entry(MemoryRecord.from_dict(entry))
+            for op in ops:
+                self._apply(op)
+            evicted = self._evict(time.time())  # Capacity may have been lowered since the log was written
+            self._load_vectors()
+            self.store.open()
+            if not self._spill() and (evicted or self.store.migrated or self.store.log_records > self.compact_min_records):
+                self._snapshot()
 
     def save_memory(self):
-        """ Saves memory data persistently """
+        """ Snapshots the current memory and truncates the write-ahead log """
         with self.lock:
-            with open(self.memory_file, "w") as file:
-                json.dump(self.memory, file, indent=4)
+            self._snapshot()
+            self.vectors.save(self.vector_file)
+
+    def _snapshot(self):
+        """ Writes the hot entries and the cold manifest as the new snapshot (caller holds the lock) """
+        records = (entry.to_dict() for entry in self.memory.values())
+        self.store.compact(records, {"cold": self.cold.manifest(), "next_id": self.next_id})
+        self.cold.cleanup()
+
+    def _spill(self):
+        """ Moves the oldest hot entries into cold segments once the hot tier is full; returns True if it did """
+        if len(self.memory) < self.hot_entries + self.segment_entries:
+            return False
+        while len(self.memory) >= self.hot_entries + self.segment_entries:
+            records = list(itertools.islice(self.memory.values(), self.segment_entries))
+            self.cold.flush(records, np.stack([self.vectors.vector(entry.id) for entry in records]))
+            for entry in records:
+                self._remove_entry(entry.id)
+        self._snapshot()  # The new segment is durable; the snapshot makes it part of the state
+        return True
+
+    def _load_vectors(self):
+        """ Loads the persisted ANN index and reconciles it with the replayed memory """
+        if os.path.exists(self.vector_file) and self.vectors.load(self.vector_file):
+            for doc_id in self.vectors.ids[:self.vectors.count].tolist():
+                if doc_id not in self.memory:
+                    self.vectors.remove(doc_id)
+        missing = [entry for entry in self.memory.values() if not self.vectors.contains(entry.id)]
+        if missing and self.vectors.count and missing[0].id <= self.vectors.ids[self.vectors.count - 1]:
+            self.vectors.clear()  # Out of step with the log: rebuild from scratch
+            missing = list(self.memory.values())
+        for entry in missing:
+            self.vectors.add(entry.id, self.embedder.embed(entry.data))
+        self.vectors_ready = True
+
+    # ========================== LAZY DECAY ==========================
+    # An entry stores its base recall `weight` as of `touched` (epoch seconds);
+    # its effective weight at time t is base * exp(-lambda * (t - touched)).
+    # log(effective) = score - lambda * t with score = log(base) + lambda * touched,
+    # so the score orders entries by effective weight at any moment and never
+    # needs updating as time passes. Decay is therefore computed on read, and
+    # pruning pops only the entries whose score fell below the threshold.
+    def _score(self, entry):
+        return math.log(entry.weight) + self.decay_lambda * entry.touched
+
+    def _effective_weight(self, entry, now):
+        return entry.weight * math.exp(-self.decay_lambda * (now - entry.touched))
+
+    def _push_decay(self, entry):
+        heapq.heappush(self.decay_heap, (self._score(entry), entry.id))
+        if len(self.decay_heap) > 2 * len(self.memory) + 1024:
+            # Reinforcements leave stale heap items behind; rebuild once they dominate
+            self.decay_heap = [(self._score(m), m.id) for m in self.memory.values()]
+            heapq.heapify(self.decay_heap)
+
+    def _lowest(self):
+        """ (score, id) of the entry with the lowest effective weight across both tiers, or None """
+        while self.decay_heap:
+            score, entry_id = self.decay_heap[0]
+            entry = self.memory.get(entry_id)
+            if entry is not None and self._score(entry) == score:
+                break
+            heapq.heappop(self.decay_heap)
+        hot = self.decay_heap[0] if self.decay_heap else None
+        cold = self.cold.lowest()
+        return cold if cold is not None and (hot is None or cold[0] < hot[0]) else hot
+
+    def _prune(self, now):
+        """ Forgets entries whose effective weight has decayed to the threshold; returns how many """
+        cutoff = math.log(self.prune_threshold) + self.decay_lambda * now
+        pruned = 0
+        lowest = self._lowest()
+        while lowest is not None and lowest[0] <= cutoff:
+            self._remove_entry(lowest[1])
+            pruned += 1
+            lowest = self._lowest()
+        return pruned
+
+    def _evict(self, now):
+        """ Removes entries until memory is within capacity, lowest effective weight first; returns their ids
+
+        The decay order's minimum is exactly the entry with the lowest effective
+        weight, so eviction pops from it like pruning does. Expired entries are
+        pruned first so they never count against the capacity.
+        """
+        self._prune(now)
+        evicted = []
+        while len(self.memory) + self.cold.live > self.capacity:
+            lowest = self._lowest()
+            if lowest is None:
+                break
+            self._remove_entry(lowest[1])
+            evicted.append(lowest[1])
+        return sorted(evicted)
+
+    def _view(self, entry, now):
+        """ Dict form of an entry with its decayed weight, for responses """
+        return {"id": entry.id, "timestamp": entry.timestamp(), "data": entry.data,
+                "recall_weight": round(self._effective_weight(entry, now), 4)}
+
+    def _add_entry(self, entry, vector=None):
+        self.memory[entry.id] = entry
+        self.index.add(entry.id, entry.data)
+        self.next_id = max(self.next_id, entry.id + 1)
+        self._push_decay(entry)
+        if self.vectors_ready:
+            self.vectors.add(entry.id, vector if vector is not None else self.embedder.embed(entry.data))
+
+    def _remove_entry(self, entry_id):
+        entry = self.memory.pop(entry_id, None)
+        if entry is not None:
+            self.index.remove(entry_id, entry.data)
+            self.vectors.remove(entry_id)
+        else:
+            self.cold.forget(entry_id)
+
+    def _entry(self, entry_id):
+        """ Hot entry, or the cold one paged in from its segment """
+        entry = self.memory.get(entry_id)
+        return entry if entry is not None else self.cold.get(entry_id)
+
+    def _entry_score(self, entry_id):
+        entry = self.memory.get(entry_id)
+        return self._score(entry) if entry is not None else self.cold.score(entry_id)
+
+    def _apply(self, op, vector=None):
+        """ Applies one logged mutation to the in-memory state (live or during replay) """
+        kind = op["op"]
+        if kind == "add":
+            self._add_entry(MemoryRecord.from_dict(op["entry"]), vector)
+        elif kind == "forget":
+            for entry_id in op["ids"]:
+                self._remove_entry(entry_id)
+        elif kind == "clear":
+            self.memory = {}
+            self.index.clear()
+            self.vectors.clear()
+            self.cold.clear()
+        elif kind == "reinforce":
+            now = op["time"]
+            for entry_id in op["ids"]:
+                entry = self.memory.get(entry_id)
+                if entry is not None:
+                    entry.weight = self._effective_weight(entry, now) * op["factor"]
+                    entry.touched = now
+                    self._push_decay(entry)
+                else:
+                    entry = self.cold.get(entry_id)
+                    if entry is not None:
+                        self.cold.reinforce(entry_id, self._effective_weight(entry, now) * op["factor"], now)
+        elif kind == "decay":
+            # Eager decay records from logs written before decay became lazy
+            for entry in self.memory.values():
+                entry.weight *= op["factor"]
+            self.decay_heap = [(self._score(m), m.id) for m in self.memory.values()]
+            heapq.heapify(self.decay_heap)
+
+    def _commit(self, op, vector=None):
+        """ Applies and logs a mutation (caller holds the lock); returns the LSN to wait on """
+        self._apply(op, vector)
+        lsn = self.store.append(op)
+        if not self._spill() and self.store.log_records > max(self.compact_min_records, len(self.memory)):
+            self._snapshot()
+        return lsn
 
     def remember(self, data):
         """ Stores new memory with a timestamp """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        entry = {"timestamp": timestamp, "data": data}
+        vector = self.embedder.embed(data)  # Computed before taking the lock
         with self.lock:
-            self.memory.append(entry)
-            self.save_memory()
+            entry = MemoryRecord(self.next_id, data, time.time())
+            self.next_id += 1
+            lsn = self._commit({"op": "add", "entry": entry.to_dict()}, vector)
+            evicted = self._evict(entry.touched) if len(self.memory) + self.cold.live > self.capacity else None
+            if evicted:
+                # Logged like FORGET so replay evicts the same entries
+                lsn = self._commit({"op": "forget", "ids": evicted})
+        self.store.wait_durable(lsn)  # Outside the lock so concurrent writers share one fsync
         return "🧠 Memory stored successfully."
 
+    def _latest(self, num_entries):
+        """ Returns the newest entries, oldest first, reaching into cold storage only if the hot tier is short """
+        newest = list(itertools.islice(reversed(self.memory.values()), num_entries))
+        if len(newest) < num_entries:
+            newest += self.cold.latest(num_entries - len(newest))
+        return newest[::-1]
+
+    def _ranked(self, ids, num_entries):
+        """ Ranks matching entries by effective recall weight, then recency """
+        top = heapq.nlargest(num_entries, ids, key=lambda i: (self._entry_score(i), i))
+        return [self._entry(i) for i in top]
+
+    def _search(self, query):
+        """ Ids matching the keyword query in the hot index and the cold segment indexes """
+        return self.index.search(query) | self.cold.search(query)
+
     def recall(self, query=None, num_entries=10):
         """ Retrieves stored memories based on recall priority """
+        now = time.time()
         with self.lock:
             if query:
-                results = [m for m in self.memory if query.lower() in m["data"].lower()]
-                return json.dumps(results[:num_entries], indent=4) if results else "🛑 No matching memories found."
+                results = self._ranked(self._search(query), num_entries)
+                if not results:
+                    return "🛑 No matching memories found."
+            elif self.memory or self.cold.live:
+                results = self._latest(num_entries)
             else:
-                return json.dumps(self.memory[-num_entries:], indent=4) if self.memory else "🛑 No memory available."
+                return "🛑 No memory available."
+            results = [self._view(entry, now) for entry in results]
+        return json.dumps(results, indent=4)
+
+    def recall_similar(self, text, num_entries=10):
+        """ Retrieves memories semantically close to the text via the ANN index """
+        vector = self.embedder.embed(text)
+        now = time.time()
+        with self.lock:
+            hits = self.vectors.search(vector, num_entries) + self.cold.similar(vector, num_entries)
+            hits = heapq.nlargest(num_entries, hits, key=lambda hit: hit[1])
+            results = [dict(self._view(self._entry(i), now), similarity=round(score, 4)) for i, score in hits]
+        return json.dumps(results, indent=4) if results else "🛑 No similar memories found."
 
     def reinforce_memory(self, query):
         """ Increases recall weight for frequently accessed memories """
         with self.lock:
-            for entry in self.memory:
-                if query.lower() in entry["data"].lower():
-                    entry["recall_weight"] = entry.get("recall_weight", 1.0) * 1.2  # Reinforce recall weight
-            self.save_memory()
+            ids = sorted(self._search(query))
+            lsn = self._commit({"op": "reinforce", "ids": ids, "factor": 1.2, "time": time.time()}) if ids else 0
+        self.store.wait_durable(lsn)
         return "🔗 Memory reinforcement applied."
 
     def forget_last(self, num_entries=1):
         """ Deletes the last X memory entries """
         with self.lock:
-            if len(self.memory) >= num_entries:
-                del self.memory[-num_entries:]
-                self.save_memory()
-                return f"🧠 Deleted last {num_entries} memory entries."
+            if len(self.memory) + self.cold.live >= num_entries:
+                ids = [m.id for m in self._latest(num_entries)]
+                lsn = self._commit({"op": "forget", "ids": ids})
             else:
                 return "🛑 Not enough memory entries to delete."
+        self.store.wait_durable(lsn)
+        return f"🧠 Deleted last {num_entries} memory entries."
 
     def forget_all(self):
         """ Clears all stored memory """
         with self.lock:
-            self.memory = []
-            self.save_memory()
+            lsn = self._commit({"op": "clear"})
+        self.store.wait_durable(lsn)
         return "🧠 All memory has been erased."
 
     def decay_memory(self):
-        """ Implements memory decay: old or unused memories fade over time """
+        """ Implements memory decay: old or unused memories fade over time
+
+        Weights decay lazily on read, so this only prunes memories that have
+        faded below the threshold. Pruning is a pure function of time and is
+        not logged; replay re-applies it on load.
+        """
         with self.lock:
-            for entry in self.memory:
-                entry["recall_weight"] *= 0.95  # Gradual decay
-            self.memory = [m for m in self.memory if m["recall_weight"] > 0.1]  # Remove weak memories
-            self.save_memory()
-        return "🧠 Memory decay applied—irrelevant data pruned."
+            pruned = self._prune(time.time())
+            if self.cold.maintain():
+                self._snapshot()
+        return f"🧠 Memory decay applied—{pruned} irrelevant memories pruned."
 
     # ========================== MEMORY AI SERVER ==========================
     def start(self):
@@ -94,41 +337,28 @@ class MemoryAI:
 
         print("\n🧠 Memory AI is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Handles incoming memory requests via socket communication """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                    thread.start()
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
-    def handle_connection(self, conn):
+    def handle_message(self, message):
         """ Processes memory storage and retrieval requests """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                if message.startswith("RECALL"):
-                    num = int(message.split(" ")[1]) if len(message.split()) > 1 else 10
-                    response = self.recall(num_entries=num)
-                elif message.startswith("REINFORCE"):
-                    query = message.replace("REINFORCE:", "").strip()
-                    response = self.reinforce_memory(query)
-                elif message.startswith("FORGET_LAST"):
-                    num = int(message.split(" ")[1]) if len(message.split()) > 1 else 1
-                    response = self.forget_last(num)
-                elif message.startswith("FORGET_ALL"):
-                    response = self.forget_all()
-                else:
-                    response = self.remember(message)
-
-                conn.sendall(response.encode())
-        except Exception as e:
-            print(f"⚠️ Connection Error: {e}")
+        if message.startswith("RECALL_SIMILAR"):
+            head, _, text = message.partition(":")
+            num = int(head.split()[1]) if len(head.split()) > 1 else 10
+            response = self.recall_similar(text.strip(), num_entries=num)
+        elif message.startswith("RECALL"):
+            # RECALL [n] or RECALL [n]:<query> where the query supports AND/OR terms
+            head, _, query = message.partition(":")
+            num = int(head.split()[1]) if len(head.split()) > 1 else 10
+            response = self.recall(query.strip() or None, num_entries=num)
+        elif message.startswith("REINFORCE"):
+            query = message.replace("REINFORCE:", "").strip()
+            response = self.reinforce_memory(query)
+        elif message.startswith("FORGET_LAST"):
+            num = int(message.split(" ")[1]) if len(message.split()) > 1 else 1
+            response = self.forget_last(num)
+        elif message.startswith("FORGET_ALL"):
+            response = self.forget_all()
+        else:
+            response = self.remember(message)
+        return response
 
     def run_decay_process(self):
         """ Periodically applies memory decay to maintain optimal storage """
@@ -139,6 +369,8 @@ class MemoryAI:
     def stop(self):
         """ Gracefully stops the Memory AI """
         self.running = False
+        self.save_memory()
+        self.store.close()
         print("🛑 Memory AI has been stopped.")
 
     # ========================== NETWORK COMMUNICATION ==========================
@@ -163,17 +395,14 @@ class MemoryAI:
 
         target_port = ports[target_bot]
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect((self.host, target_port))
-                s.sendall(message.encode())
-                response = s.recv(1024).decode()
-                return response
+            return default_pool.request(self.host, target_port, message)
         except Exception as e:
             return f"❌ Error communicating with {target_bot}: {e}"
 
 # ========================== MEMORY AI INITIALIZATION ==========================
 if __name__ == "__main__":
     memory_ai = MemoryAI()
+    gc.freeze()  # The loaded records are long-lived; keep them out of future GC passes
     memory_ai.start()
 
 # AI Improvements:
@@ -0,0 +1,59 @@
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """ Splits text into lowercase word tokens """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query):
+    """ Splits an AND/OR query into clauses, each a set of terms that must all match """
+    clauses = []
+    for clause in re.split(r"\s+OR\s+", query.strip()):
+        terms = set(tokenize(clause)) - {"and"}
+        if terms:
+            clauses.append(terms)
+    return clauses
+
+
+class InvertedIndex:
+    """ Token -> entry-id postings, maintained incrementally as entries come and go
+
+    Queries are whitespace-separated terms combined with AND; `OR` splits the
+    query into alternatives, e.g. "market crash OR recession" matches entries
+    containing both "market" and "crash", or containing "recession".
+    """
+
+    def __init__(self):
+        self.postings = {}
+
+    def add(self, doc_id, text):
+        for token in set(tokenize(text)):
+            self.postings.setdefault(token, set()).add(doc_id)
+
+    def remove(self, doc_id, text):
+        for token in set(tokenize(text)):
+            ids = self.postings.get(token)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[token]
+
+    def clear(self):
+        self.postings = {}
+
+    def search(self, query):
+        """ Returns the set of entry ids matching the AND/OR query """
+        matches = set()
+        for terms in parse_query(query):
+            # Intersect starting from the rarest term to keep the work proportional to the result
+            postings = sorted((self.postings.get(term, set()) for term in terms), key=len)
+            result = set(postings[0])
+            for ids in postings[1:]:
+                if not result:
+                    break
+                result &= ids
+            matches |= result
+        return matches
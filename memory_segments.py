@@ -0,0 +1,449 @@
+import bisect
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from memory_index import parse_query, tokenize
+from memory_store import MemoryRecord
+from vector_index import list_count, spherical_kmeans
+
+MAGIC = b"MSEG1\n"
+HEADER = struct.Struct("!I")  # Length of the JSON layout that follows the magic
+ALIGNMENT = 64
+IVF_MIN_ROWS = 4096  # Smaller segments are scanned exactly
+
+
+def token_hash(token):
+    """ Stable 64-bit token hash used as the key of a segment's postings table """
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+
+class Segment:
+    """ One immutable, memory-mapped run of cold memory entries
+
+    A segment is a single file: a small JSON layout followed by aligned arrays
+    (ids, timestamps, weights, decay scores, text offsets and bytes, vectors)
+    plus a per-segment keyword index of sorted token hashes -> row postings
+    and, when the cold tier has trained IVF centroids, the centroid set the
+    rows were assigned to and the rows of each of its lists.
+    Arrays are NumPy views straight onto the mapping, so opening a segment
+    reads only its header and pages are loaded by the OS when first touched.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a memory segment.")
+        (length,) = HEADER.unpack_from(self._mmap, len(MAGIC))
+        start = len(MAGIC) + HEADER.size
+        layout = json.loads(self._mmap[start:start + length])
+        data_start = _aligned(start + length)
+        self.count = layout["count"]
+        self.dim = layout["dim"]
+        self.decay_lambda = layout["decay_lambda"]
+        arrays = {}
+        for name, (dtype, shape, offset) in layout["arrays"].items():
+            size = int(np.prod(shape))
+            arrays[name] = np.frombuffer(self._mmap, dtype=dtype, count=size, offset=data_start + offset).reshape(shape)
+        self.ids = arrays["ids"]
+        self.created = arrays["created"]
+        self.weight = arrays["weight"]
+        self.touched = arrays["touched"]
+        self.score = arrays["score"]
+        self.order = arrays["order"]  # Rows by ascending decay score
+        self.offsets = arrays["offsets"]
+        self.text = arrays["text"]
+        self.vectors = arrays["vectors"]
+        self.token_hashes = arrays["token_hashes"]
+        self.token_starts = arrays["token_starts"]
+        self.postings = arrays["postings"]
+        self.ivf_set = layout.get("ivf_set")  # None: no IVF lists, similarity search scans every row
+        self.ivf_trained_at = layout.get("ivf_trained_at", 0)
+        self.centroids = arrays.get("centroids")
+        self.list_starts = arrays.get("list_starts")
+        self.list_rows = arrays.get("list_rows")
+        self.first_id = int(self.ids[0])
+        self.last_id = int(self.ids[-1])
+
+    @staticmethod
+    def write(path, records, vectors, decay_lambda, ivf=None):
+        """ Writes records (sorted by id) and their vectors as a new segment file
+
+        `ivf` is (set id, centroids, trained_at) of the cold tier's current
+        centroid set; the rows are assigned to its lists.
+        """
+        encoded = [record.data.encode() for record in records]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(text) for text in encoded])
+        weight = np.array([record.weight for record in records], dtype=np.float64)
+        touched = np.array([record.touched for record in records], dtype=np.float64)
+        score = np.log(weight) + decay_lambda * touched
+
+        postings, hashes = {}, {}
+        for row, record in enumerate(records):
+            for token in set(tokenize(record.data)):
+                h = hashes.get(token)
+                if h is None:
+                    h = hashes[token] = token_hash(token)
+                postings.setdefault(h, []).append(row)
+        token_hashes = np.array(sorted(postings), dtype=np.uint64)
+        lists = [postings[h] for h in token_hashes.tolist()]
+        token_starts = np.zeros(len(lists) + 1, dtype=np.int64)
+        token_starts[1:] = np.cumsum([len(rows) for rows in lists])
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ivf_layout = {}
+        if ivf is not None:
+            set_id, centroids, trained_at = ivf
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            list_rows = np.argsort(assignment, kind="stable").astype(np.int32)
+            list_starts = np.searchsorted(assignment[list_rows], np.arange(len(centroids) + 1)).astype(np.int64)
+            ivf_layout = {"ivf_set": set_id, "ivf_trained_at": trained_at}
+        else:
+            centroids = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            list_rows = np.zeros(0, dtype=np.int32)
+            list_starts = np.zeros(1, dtype=np.int64)
+
+        arrays = {
+            "ids": np.array([record.id for record in records], dtype=np.int64),
+            "created": np.array([record.created for record in records], dtype=np.float64),
+            "weight": weight,
+            "touched": touched,
+            "score": score,
+            "order": np.argsort(score, kind="stable").astype(np.int32),
+            "offsets": offsets,
+            "vectors": vectors,
+            "centroids": centroids,
+            "list_starts": list_starts,
+            "list_rows": list_rows,
+            "token_hashes": token_hashes,
+            "token_starts": token_starts,
+            "postings": np.array([row for rows in lists for row in rows], dtype=np.int32),
+            "text": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        }
+        layout, offset = {}, 0
+        for name, array in arrays.items():
+            layout[name] = [array.dtype.str, list(array.shape), offset]
+            offset = _aligned(offset + array.nbytes)
+        header = json.dumps({"count": len(records), "dim": arrays["vectors"].shape[1],
+                             "decay_lambda": decay_lambda, **ivf_layout, "arrays": layout}).encode()
+
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(MAGIC + HEADER.pack(len(header)) + header)
+            data_start = _aligned(file.tell())
+            for name, array in arrays.items():
+                file.seek(data_start + layout[name][2])
+                file.write(array.tobytes())
+            file.truncate(data_start + offset)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+    def row(self, entry_id):
+        row = int(np.searchsorted(self.ids, entry_id))
+        return row if row < self.count and self.ids[row] == entry_id else None
+
+    def data(self, row):
+        return bytes(self.text[self.offsets[row]:self.offsets[row + 1]]).decode()
+
+    def record(self, row):
+        return MemoryRecord(int(self.ids[row]), self.data(row), float(self.created[row]),
+                            float(self.weight[row]), float(self.touched[row]))
+
+    def rows_for(self, token):
+        """ Rows whose text contains the token, from the per-segment postings table """
+        h = np.uint64(token_hash(token))
+        i = int(np.searchsorted(self.token_hashes, h))
+        if i == len(self.token_hashes) or self.token_hashes[i] != h:
+            return self.postings[:0]
+        return self.postings[self.token_starts[i]:self.token_starts[i + 1]]
+
+    def candidates(self, lists):
+        """ Rows in the given lists of the segment's centroid set, or every row if it has none """
+        if self.ivf_set is None:
+            return np.arange(self.count)
+        return np.concatenate([self.list_rows[self.list_starts[c]:self.list_starts[c + 1]] for c in lists])
+
+    def scores(self, decay_lambda):
+        """ Decay scores and their ascending order, recomputed only if the decay rate changed """
+        if decay_lambda == self.decay_lambda:
+            return self.score, self.order
+        score = np.log(self.weight) + decay_lambda * self.touched
+        self.score, self.order, self.decay_lambda = score, np.argsort(score, kind="stable"), decay_lambda
+        return self.score, self.order
+
+
+class ColdTier:
+    """ Immutable segments holding every memory that has aged out of the hot tier
+
+    Segments never change once written. Forgetting a cold entry records a
+    tombstone and reinforcing one records an override of its weight; both are
+    small and are persisted with the MemoryAI snapshot as part of `manifest()`.
+    A segment whose rows are mostly tombstoned is rewritten by `maintain()`.
+
+    For similarity search the cold tier keeps one set of IVF centroids that
+    every new segment is assigned to, retrained (like the hot IVFIndex) each
+    time the tier has grown 4x. Segments keep the set they were written with,
+    so a query probes the `nprobe` nearest lists once per centroid set and
+    then only gathers those lists' rows from each segment.
+    Replaced segment files are only deleted by `cleanup()`, after the snapshot
+    that stops referencing them is durable.
+    """
+
+    def __init__(self, directory, decay_lambda, nprobe=16):
+        self.directory = directory
+        self.decay_lambda = decay_lambda
+        self.nprobe = nprobe  # IVF lists probed per centroid set by similar()
+        self.ivf = None  # (set id, centroids, trained_at) that new segments are assigned to
+        self.segments = []  # Ordered by id range
+        self.overrides = {}  # id -> (weight, touched) for reinforced cold entries
+        self.tombstones = set()  # Ids forgotten since their segment was written
+        self.retired = []
+        self.next_segment = 1
+        self.live = 0
+        self._reset_scan()
+
+    # ========================== MANIFEST ==========================
+    def open(self, manifest):
+        """ Maps the segments named in a snapshot manifest and drops files it does not name """
+        os.makedirs(self.directory, exist_ok=True)
+        names = manifest.get("segments", [])
+        self.segments = [Segment(os.path.join(self.directory, name)) for name in names]
+        self.overrides = {entry_id: (weight, touched) for entry_id, weight, touched in manifest.get("overrides", [])}
+        self.tombstones = set(manifest.get("tombstones", []))
+        self.next_segment = manifest.get("next_segment", 1)
+        self.retired = []
+        self.live = sum(segment.count for segment in self.segments) - len(self.tombstones)
+        self.ivf = None
+        for segment in self.segments:
+            if segment.ivf_set is not None and (self.ivf is None or segment.ivf_set > self.ivf[0]):
+                self.ivf = (segment.ivf_set, np.array(segment.centroids), segment.ivf_trained_at)
+        self._reset_scan()
+        for name in os.listdir(self.directory):
+            if name not in names:
+                os.remove(os.path.join(self.directory, name))  # Left by a flush that crashed before its snapshot
+
+    def manifest(self):
+        return {
+            "segments": [segment.name for segment in self.segments],
+            "overrides": [[entry_id, weight, touched] for entry_id, (weight, touched) in self.overrides.items()],
+            "tombstones": sorted(self.tombstones),
+            "next_segment": self.next_segment,
+        }
+
+    def cleanup(self):
+        """ Deletes replaced segment files once a snapshot no longer refers to them """
+        for segment in self.retired:
+            if os.path.exists(segment.path):
+                os.remove(segment.path)
+        self.retired = []
+
+    # ========================== LOOKUP ==========================
+    def _locate(self, entry_id):
+        i = bisect.bisect_right(self._first_ids, entry_id) - 1
+        if i < 0 or entry_id in self.tombstones:
+            return None, None
+        segment = self.segments[i]
+        row = segment.row(entry_id)
+        return (segment, row) if row is not None else (None, None)
+
+    def contains(self, entry_id):
+        return self._locate(entry_id)[0] is not None
+
+    def get(self, entry_id):
+        """ Materializes one cold entry as a MemoryRecord, with any reinforcement applied """
+        segment, row = self._locate(entry_id)
+        if segment is None:
+            return None
+        record = segment.record(row)
+        if entry_id in self.overrides:
+            record.weight, record.touched = self.overrides[entry_id]
+        return record
+
+    def score(self, entry_id):
+        """ Decay score of a cold entry without decoding its text """
+        if entry_id in self.overrides:
+            weight, touched = self.overrides[entry_id]
+            return np.log(weight) + self.decay_lambda * touched
+        segment, row = self._locate(entry_id)
+        return float(segment.scores(self.decay_lambda)[0][row])
+
+    def search(self, query):
+        """ Ids of cold entries matching the AND/OR query, via each segment's postings """
+        matches = set()
+        for terms in parse_query(query):
+            for segment in self.segments:
+                postings = sorted((segment.rows_for(term) for term in terms), key=len)
+                rows = postings[0]
+                for other in postings[1:]:
+                    if len(rows) == 0:
+                        break
+                    rows = np.intersect1d(rows, other, assume_unique=True)
+                matches.update(segment.ids[rows].tolist())
+        return matches - self.tombstones
+
+    def similar(self, vector, k):
+        """ Approximate [(id, similarity)] over cold vectors, probing the nearest IVF lists of each centroid set """
+        probes = {}  # centroid set -> nearest lists
+        hits = []
+        for segment in self.segments:
+            lists = probes.get(segment.ivf_set)
+            if lists is None and segment.ivf_set is not None:
+                probe = min(self.nprobe, len(segment.centroids))
+                lists = probes[segment.ivf_set] = np.argpartition(-(segment.centroids @ vector), probe - 1)[:probe]
+            rows = segment.candidates(lists)
+            dead = self._dead_rows(segment)
+            if len(dead):
+                rows = rows[~np.isin(rows, dead)]
+            if len(rows) == 0:
+                continue
+            scores = segment.vectors[rows] @ vector
+            top = np.argpartition(-scores, min(k, len(rows)) - 1)[:k]
+            hits.extend((float(scores[i]), int(segment.ids[rows[i]])) for i in top)
+        return [(entry_id, score) for score, entry_id in heapq.nlargest(k, hits)]
+
+    def latest(self, num_entries):
+        """ Newest live cold entries, newest first """
+        results = []
+        for segment in reversed(self.segments):
+            for row in range(segment.count - 1, -1, -1):
+                if len(results) == num_entries:
+                    return results
+                entry_id = int(segment.ids[row])
+                if entry_id not in self.tombstones:
+                    results.append(self.get(entry_id))
+        return results
+
+    def _dead_rows(self, segment):
+        ids = [i for i in self.tombstones if segment.first_id <= i <= segment.last_id]
+        return np.searchsorted(segment.ids, ids) if ids else np.empty(0, dtype=np.int64)
+
+    # ========================== MUTATION ==========================
+    def _train(self, vectors, size):
+        """ Retrains the shared centroids once the tier has grown 4x; returns the set new segments use """
+        if size < IVF_MIN_ROWS or (self.ivf is not None and size < 4 * self.ivf[2]):
+            return self.ivf
+        n_lists = list_count(4 * size)  # Sized for the tier this set serves until the next retrain
+        # Train on the incoming vectors plus an even sample of the rows already in segments
+        rng = np.random.default_rng(self.next_segment)
+        per_segment = 64 * n_lists // max(1, len(self.segments)) + 1
+        sample = np.concatenate([vectors] + [
+            segment.vectors[np.sort(rng.choice(segment.count, min(segment.count, per_segment), replace=False))]
+            for segment in self.segments])
+        self.ivf = (self.next_segment, spherical_kmeans(sample, n_lists), size)
+        return self.ivf
+
+    def flush(self, records, vectors):
+        """ Writes hot records (ascending ids, all newer than existing segments) as a new segment """
+        name = f"segment-{self.next_segment:06d}.mseg"
+        path = os.path.join(self.directory, name)
+        Segment.write(path, records, vectors, self.decay_lambda, self._train(vectors, self.live + len(records)))
+        _fsync_directory(self.directory)
+        self.next_segment += 1
+        self.segments.append(Segment(path))
+        self.live += len(records)
+        self._reset_scan()
+
+    def forget(self, entry_id):
+        if self._locate(entry_id)[0] is None:
+            return False
+        self.tombstones.add(entry_id)
+        self.overrides.pop(entry_id, None)
+        self.live -= 1
+        return True
+
+    def reinforce(self, entry_id, weight, touched):
+        self.overrides[entry_id] = (weight, touched)
+        heapq.heappush(self._override_heap, (np.log(weight) + self.decay_lambda * touched, entry_id))
+
+    def clear(self):
+        self.retired.extend(self.segments)
+        self.segments = []
+        self.overrides = {}
+        self.tombstones = set()
+        self.live = 0
+        self.ivf = None
+        self._reset_scan()
+
+    def maintain(self):
+        """ Rewrites segments that are mostly tombstones; returns True if the manifest changed """
+        changed = False
+        for i, segment in enumerate(self.segments):
+            dead = self._dead_rows(segment)
+            if 2 * len(dead) <= segment.count:
+                continue
+            alive = np.ones(segment.count, dtype=bool)
+            alive[dead] = False
+            rows = np.flatnonzero(alive)
+            self.tombstones.difference_update(segment.ids[dead].tolist())
+            if len(rows):
+                records = [self.get(int(segment.ids[row])) for row in rows]
+                name = f"segment-{self.next_segment:06d}.mseg"
+                Segment.write(os.path.join(self.directory, name), records, segment.vectors[rows], self.decay_lambda,
+                              self.ivf)
+                self.next_segment += 1
+                for record in records:
+                    self.overrides.pop(record.id, None)  # Folded into the new segment
+                self.segments[i] = Segment(os.path.join(self.directory, name))
+            else:
+                self.segments[i] = None
+            self.retired.append(segment)
+            changed = True
+        if changed:
+            self.segments = [segment for segment in self.segments if segment is not None]
+            _fsync_directory(self.directory)
+            self._reset_scan()
+        return changed
+
+    # ========================== DECAY ORDER ==========================
+    # Rows of a segment are pre-sorted by decay score, so the coldest live entry
+    # is found by advancing one cursor per segment past tombstoned and overridden
+    # rows; overridden (reinforced) entries are ordered by their own heap.
+    def _reset_scan(self):
+        self._first_ids = [segment.first_id for segment in self.segments]
+        self._cursors = [0] * len(self.segments)
+        self._override_heap = [(np.log(w) + self.decay_lambda * t, i) for i, (w, t) in self.overrides.items()]
+        heapq.heapify(self._override_heap)
+
+    def lowest(self):
+        """ Returns (score, id) of the live cold entry with the lowest effective weight, or None """
+        best = None
+        for i, segment in enumerate(self.segments):
+            score, order = segment.scores(self.decay_lambda)
+            position = self._cursors[i]
+            while position < segment.count:
+                entry_id = int(segment.ids[order[position]])
+                if entry_id not in self.tombstones and entry_id not in self.overrides:
+                    break
+                position += 1
+            self._cursors[i] = position
+            if position < segment.count and (best is None or score[order[position]] < best[0]):
+                best = (float(score[order[position]]), int(segment.ids[order[position]]))
+        while self._override_heap:
+            score, entry_id = self._override_heap[0]
+            weight_touched = self.overrides.get(entry_id)
+            if weight_touched and np.log(weight_touched[0]) + self.decay_lambda * weight_touched[1] == score:
+                if best is None or score < best[0]:
+                    best = (float(score), entry_id)
+                break
+            heapq.heappop(self._override_heap)  # Stale: re-reinforced or forgotten
+        return best
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _fsync_directory(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,207 @@
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+
+class MemoryRecord:
+    """ Compact in-memory form of one memory entry
+
+    Slots instead of a per-entry dict, an epoch float instead of a formatted
+    timestamp string, and interned text so repeated memories share one string.
+    `weight` is the base recall weight as of `touched` (see MemoryAI lazy decay).
+    """
+    __slots__ = ("id", "data", "created", "weight", "touched")
+
+    def __init__(self, entry_id, data, created, weight=1.0, touched=None):
+        self.id = entry_id
+        self.data = sys.intern(data)
+        self.created = created
+        self.weight = weight
+        self.touched = created if touched is None else touched
+
+    @classmethod
+    def from_dict(cls, entry):
+        """ Builds a record from its logged form, including pre-epoch "timestamp" entries """
+        # Legacy entries never decayed: their weight counts from when they are first loaded, not from "timestamp"
+        touched = entry.get("touched", time.time())
+        created = entry.get("created")
+        if created is None:
+            try:
+                created = datetime.strptime(entry["timestamp"], "%Y-%m-%d %H:%M:%S").timestamp()
+            except (KeyError, ValueError):
+                created = touched
+        return cls(entry["id"], entry["data"], created, entry.get("recall_weight", 1.0), touched)
+
+    def to_dict(self):
+        return {"id": self.id, "data": self.data, "created": self.created,
+                "recall_weight": self.weight, "touched": self.touched}
+
+    def timestamp(self):
+        return datetime.fromtimestamp(self.created).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class MemoryStore:
+    """ Snapshot + append-only write-ahead log persistence for MemoryAI
+
+    Every mutation is appended to the log as one JSON line tagged with a log
+    sequence number (LSN). A background flusher fsyncs whatever has accumulated
+    in one go (group commit), so concurrent writers share the cost of a sync.
+    Compaction writes the full state to a new snapshot, atomically swaps it in
+    and truncates the log; the LSN stored in the snapshot header lets replay
+    skip log records that the snapshot already contains. The header also
+    carries `meta`, caller state that belongs with the snapshot (MemoryAI keeps
+    its cold segment manifest there).
+    """
+
+    def __init__(self, memory_file, sync=True):
+        base = os.path.splitext(memory_file)[0]
+        self.legacy_path = memory_file  # Old single-file JSON array, migrated on first load
+        self.snapshot_path = base + ".snapshot.jsonl"
+        self.wal_path = base + ".wal.jsonl"
+        self.sync = sync  # Wait for fsync before acknowledging a write
+        self.lsn = 0
+        self.log_records = 0
+        self._written_lsn = 0
+        self._synced_lsn = 0
+        self._wal = None
+        self._lock = threading.Lock()  # Guards the log file and LSN counters
+        self._sync_lock = threading.Lock()  # Held across an fsync so compaction cannot swap the file under it
+        self._synced = threading.Condition(threading.Lock())
+        self._pending = threading.Event()
+        self.running = False
+        self.migrated = False
+        self.meta = {}
+
+    # ========================== RECOVERY ==========================
+    def load(self):
+        """ Returns (snapshot_entries, log_ops) to rebuild state: snapshot first, then replay ops in order """
+        entries, snapshot_lsn = [], 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as file:
+                header = json.loads(file.readline() or "{}")
+                snapshot_lsn = header.get("lsn", 0)
+                self.meta = header.get("meta", {})
+                entries = [json.loads(line) for line in file if line.strip()]
+        elif os.path.exists(self.legacy_path) and not os.path.exists(self.wal_path):
+            with open(self.legacy_path, "r") as file:
+                entries = json.load(file)
+            entries = [dict(entry, id=i) for i, entry in enumerate(entries, 1)]
+            self.migrated = True
+
+        ops = []
+        self.lsn = snapshot_lsn
+        if os.path.exists(self.wal_path):
+            valid_bytes = 0
+            with open(self.wal_path, "rb") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # Torn write from a crash: everything after it is discarded
+                    valid_bytes += len(line)
+                    if record["lsn"] > snapshot_lsn:
+                        ops.append(record["op"])
+                        self.lsn = record["lsn"]
+            os.truncate(self.wal_path, valid_bytes)
+        self.log_records = len(ops)
+        self._written_lsn = self._synced_lsn = self.lsn
+        return entries, ops
+
+    def open(self):
+        """ Opens the log for appending and starts the background flusher """
+        self._wal = open(self.wal_path, "a")
+        self.running = True
+        threading.Thread(target=self._flusher, daemon=True).start()
+
+    # ========================== LOGGING ==========================
+    def append(self, op):
+        """ Appends one mutation to the log and returns its LSN """
+        with self._lock:
+            self.lsn += 1
+            self._wal.write(json.dumps({"lsn": self.lsn, "op": op}) + "\n")
+            self._written_lsn = self.lsn
+            self.log_records += 1
+            lsn = self.lsn
+        self._pending.set()
+        return lsn
+
+    def wait_durable(self, lsn):
+        """ Blocks until the record with this LSN is fsynced (no-op when sync is disabled) """
+        if not self.sync:
+            return
+        with self._synced:
+            while self._synced_lsn < lsn and self.running:
+                self._synced.wait(1.0)
+
+    def _mark_synced(self, lsn):
+        with self._synced:
+            self._synced_lsn = lsn
+            self._synced.notify_all()
+
+    def _sync(self):
+        """ Flushes buffered records, then fsyncs without blocking appenders during the fsync """
+        with self._sync_lock:
+            with self._lock:
+                if self._wal is None or self._written_lsn == self._synced_lsn:
+                    return
+                self._wal.flush()
+                target, fd = self._written_lsn, self._wal.fileno()
+            os.fsync(fd)
+            self._mark_synced(target)
+
+    def _flusher(self):
+        """ Group commit: one fsync covers every record appended since the last one """
+        while self.running:
+            self._pending.wait(1.0)
+            self._pending.clear()
+            self._sync()
+
+    # ========================== COMPACTION ==========================
+    def compact(self, entries, meta=None):
+        """ Writes `entries` (and `meta`) as the new snapshot and truncates the log
+
+        The caller must hold the lock that guards the in-memory state so that
+        `entries` reflects exactly the records appended so far.
+        """
+        with self._sync_lock, self._lock:
+            if self._wal is not None:
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+                self._mark_synced(self._written_lsn)
+            temp_path = self.snapshot_path + ".tmp"
+            with open(temp_path, "w") as file:
+                file.write(json.dumps({"lsn": self.lsn, "meta": meta or {}}) + "\n")
+                for entry in entries:
+                    file.write(json.dumps(entry) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.snapshot_path)
+            self._fsync_directory()
+            # A crash before this truncation is harmless: replay skips LSNs the snapshot covers
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = open(self.wal_path, "w")
+            else:
+                open(self.wal_path, "w").close()
+            self.log_records = 0
+
+    def _fsync_directory(self):
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path))
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """ Flushes outstanding records and stops the flusher """
+        self._sync()
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+        self.running = False
+        self._pending.set()
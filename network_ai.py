@@ -1,9 +1,9 @@
-import socket
 import json
 import threading
-import time
+from connection_pool import default_pool
+from async_server import AsyncBotServer
 
-class AINetwork:
+class AINetwork(AsyncBotServer):
     def __init__(self, host='localhost', port=7087):
         """ AI Network Bot: Manages AI-to-AI communication and knowledge sharing """
         self.host = host
@@ -32,24 +32,11 @@ class AINetwork:
 
         target_port = self.neural_bots[target_bot]
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect((self.host, target_port))
-                s.sendall(message.encode())
-                response = s.recv(1024).decode()
-                return response
+            return default_pool.request(self.host, target_port, message)
         except Exception as e:
             return f"❌ Error communicating with {target_bot}: {e}"
 
-    def receive_message(self, conn):
-        """ Processes incoming messages from AI Brain or other AI bots """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                return self.process_request(message)
-        except Exception as e:
-            return f"⚠️ Connection Error: {e}"
-
-    def process_request(self, message):
+    def handle_message(self, message):
         """ Handles incoming requests and routes them to appropriate AI subsystems """
         if message.startswith("BROADCAST:"):
             return self.broadcast_message(message.replace("BROADCAST:", "").strip())
@@ -74,19 +61,6 @@ class AINetwork:
         server_thread.start()
         print("\n🔗 AI Network is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Runs the AI network server to handle incoming requests """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    response = self.receive_message(conn)
-                    conn.sendall(response.encode())
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
     def stop(self):
         """ Gracefully stops the AI Network bot """
         self.running = False
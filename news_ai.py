@@ -1,18 +1,37 @@
-import socket
+import heapq
+import itertools
 import json
 import os
 import threading
 import requests
-from textblob import TextBlob
+from concurrent.futures import ThreadPoolExecutor
+from http_session import DEFAULT_TIMEOUT, make_session
+from response_cache import ResponseCache
+from news_index import BM25Index
+from news_stream import NewsStream
+from sentiment_batch import SentimentAnalyzer
 from datetime import datetime
+from async_server import AsyncBotServer
 
-class NewsAI:
-    def __init__(self, host='localhost', port=7074):  # Fixed Port
+class NewsAI(AsyncBotServer):
+    def __init__(self, host='localhost', port=7074, retention=50):  # Fixed Port
         self.host = host
         self.port = port
         self.news_file = "/workspace/ai_project/news_data.json"
-        self.load_news()
+        self.retention = retention  # Articles kept, highest confidence first
         self.lock = threading.Lock()
+        self.file_lock = threading.Lock()  # Serializes rewrites of news_file without holding self.lock
+        self.sentiment = SentimentAnalyzer()
+        self.news_api_url = "https://newsapi.org/v2/everything"
+        self.news_api_key = "YOUR_NEWS_API_KEY"
+        self.articles_per_keyword = 5
+        self.fetch_workers = 8  # Keywords fetched at once by FETCH_MANY
+        self.http = make_session(pool_size=self.fetch_workers)
+        self.fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="NewsFetch")
+        self.cache = ResponseCache(max_entries=512, ttl=120.0)  # Upstream article lists per keyword
+        self.stream_keywords = []  # Polled continuously from startup; more can be added with STREAM_START
+        self.stream = NewsStream(self)
+        self.load_news()
         self.running = True
 
         # ✅ Updated Neural Bots Port Mapping
@@ -30,20 +49,71 @@ class NewsAI:
             "network_ai": 7087  # Fixed
         }
 
+        # Editorial lean of common outlets, keyed by lowercase source name
+        self.source_bias = {
+            "reuters": "Center",
+            "associated press": "Center",
+            "bbc news": "Center",
+            "bloomberg": "Center",
+            "the wall street journal": "Center-Right",
+            "fox news": "Right",
+            "breitbart news": "Right",
+            "cnn": "Left",
+            "msnbc": "Left",
+            "the guardian": "Center-Left",
+            "the new york times": "Center-Left",
+        }
+
     # ========================== NEWS SYSTEM ==========================
     def load_news(self):
         """ Loads stored news history """
+        history = []
         if os.path.exists(self.news_file):
             with open(self.news_file, "r") as file:
-                self.news_history = json.load(file)
+                history = json.load(file)
+        # Min-heap of (confidence, -sequence, entry): the root is the article evicted next,
+        # the lowest confidence and, among equals, the newest (older articles win ties)
+        self.sequence = itertools.count()
+        self.news_heap = []
+        self.ranked = None  # Cached highest-confidence-first view, rebuilt after changes
+        self.articles = {}  # Sequence number -> retained article
+        self.news_index = BM25Index()  # Title/content/source full-text index over the retained articles
+        for entry in history:
+            self._admit(entry)
+
+    def _admit(self, entry):
+        """ Keeps the article if it is among the top `retention` by confidence (caller holds the lock) """
+        doc_id = next(self.sequence)
+        item = (entry["confidence"], -doc_id, entry)
+        if len(self.news_heap) < self.retention:
+            heapq.heappush(self.news_heap, item)
+        elif item[:2] > self.news_heap[0][:2]:
+            evicted = heapq.heapreplace(self.news_heap, item)
+            del self.articles[-evicted[1]]
+            self.news_index.remove(-evicted[1])
         else:
-            self.news_history = []
+            return False
+        self.articles[doc_id] = entry
+        self.news_index.add(doc_id, entry)
+        self.ranked = None
+        return True
+
+    @property
+    def news_history(self):
+        """ Retained articles, highest confidence first """
+        if self.ranked is None:
+            self.ranked = [item[2] for item in sorted(self.news_heap, reverse=True)]
+        return self.ranked
 
     def save_news(self, title, content, source, sentiment, confidence, bias="Unknown"):
         """ Stores news articles with metadata """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        news_entry = {
-            "timestamp": timestamp,
+        news_entry = self.news_entry(title, content, source, sentiment, confidence, bias)
+        self.save_news_batch([news_entry])
+        return f"📰 News stored: {title} (Sentiment: {sentiment}, Confidence: {confidence}%, Bias: {bias})"
+
+    def news_entry(self, title, content, source, sentiment, confidence, bias="Unknown"):
+        return {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "title": title,
             "content": content,
             "source": source,
@@ -51,98 +121,213 @@ class NewsAI:
             "confidence": confidence,
             "bias": bias
         }
+
+    def save_news_batch(self, entries):
+        """ Admits a batch of articles and rewrites news_file once if any were kept """
         with self.lock:
-            self.news_history.append(news_entry)
-            self.news_history = sorted(self.news_history, key=lambda x: x["confidence"], reverse=True)[:50]  # Keep top 50
-            with open(self.news_file, "w") as file:
-                json.dump(self.news_history, file, indent=4)
+            admitted = sum(self._admit(entry) for entry in entries)
+        if admitted:
+            self.persist_news()
+        return admitted
 
-        return f"📰 News stored: {title} (Sentiment: {sentiment}, Confidence: {confidence}%, Bias: {bias})"
+    def persist_news(self):
+        """ Atomically rewrites news_file; the lock order keeps an older state from overwriting a newer one """
+        with self.file_lock:
+            with self.lock:
+                history = list(self.news_history)
+            temp_file = self.news_file + ".tmp"
+            with open(temp_file, "w") as file:
+                json.dump(history, file)
+            os.replace(temp_file, self.news_file)
 
     def recall_news(self, query=None, num_entries=5):
-        """ Retrieves past news articles based on keywords or latest trends """
-        with self.lock:
-            if query:
-                results = [n for n in self.news_history if query.lower() in n["title"].lower()]
-                return json.dumps(results[:num_entries], indent=4) if results else "🛑 No matching news articles found."
+        """ Retrieves past news articles by BM25 relevance to the query, or by confidence without free text """
+        # Filters: sentiment=<label> bias=<label> since=<time> until=<time> limit=<n>, times as YYYY-MM-DD[THH:MM:SS]
+        terms, filters = [], {}
+        for word in (query or "").split():
+            key, _, value = word.partition("=")
+            key = key.lower()
+            if value and key in ("sentiment", "bias", "since", "until", "limit"):
+                filters[key] = value.replace("T", " ") if key in ("since", "until") else value
             else:
-                return json.dumps(self.news_history[:num_entries], indent=4) if self.news_history else "🛑 No news available."
+                terms.append(word)
+        try:
+            num_entries = int(filters.pop("limit", num_entries))
+        except ValueError:
+            return "⚠️ limit must be a number."
+        if "until" in filters and len(filters["until"]) == 10:
+            filters["until"] += " 23:59:59"  # A bare date includes the whole day
+
+        def accept(entry):
+            return (entry["sentiment"].lower() == filters.get("sentiment", entry["sentiment"]).lower()
+                    and entry["bias"].lower() == filters.get("bias", entry["bias"]).lower()
+                    and filters.get("since", "") <= entry["timestamp"] <= filters.get("until", "~"))
+
+        with self.lock:
+            if terms:
+                hits = self.news_index.search(" ".join(terms), num_entries, lambda doc_id: accept(self.articles[doc_id]))
+                results = [dict(self.articles[doc_id], score=round(score, 4)) for doc_id, score in hits]
+                return json.dumps(results, indent=4) if results else "🛑 No matching news articles found."
+            results = [entry for entry in self.news_history if accept(entry)][:num_entries] if filters else self.news_history[:num_entries]
+            return json.dumps(results, indent=4) if results else "🛑 No news available."
+
+    def sentiment_summary(self, payload, num_entries=20):
+        """ Aggregates the stored sentiment of the top matches for each query in a JSON array (null if none match) """
+        try:
+            queries = json.loads(payload)
+        except ValueError as e:
+            return f"⚠️ Invalid SENTIMENT_SUMMARY payload: {e}"
+        if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+            return "⚠️ SENTIMENT_SUMMARY needs a JSON array of queries."
+        signs = {"Positive": 1, "Negative": -1}
+        summaries = []
+        with self.lock:
+            for query in queries:
+                entries = [self.articles[doc_id] for doc_id, _ in self.news_index.search(query, num_entries)]
+                if not entries:
+                    summaries.append(None)
+                    continue
+                labels = {}
+                for entry in entries:
+                    labels[entry["sentiment"]] = labels.get(entry["sentiment"], 0) + 1
+                score = sum(signs.get(entry["sentiment"], 0) * entry["confidence"] for entry in entries) / len(entries)
+                summaries.append({
+                    "articles": len(entries),
+                    "sentiment": "Positive" if score > 0 else "Negative" if score < 0 else "Neutral",
+                    "score": round(score, 2),
+                    "labels": labels,
+                })
+        return json.dumps(summaries)
 
     # ========================== NEWS FETCHING & ANALYSIS ==========================
+    def fetch_articles(self, keyword):
+        """ Returns the top raw articles for a keyword, or None if the API gave no article list
+
+        Answers are cached per keyword, and concurrent requests for the same
+        keyword share one upstream call.
+        """
+        return self.cache.get_or_load(("articles", keyword.lower()), lambda: self._request_articles(keyword))
+
+    def _request_articles(self, keyword):
+        params = {"q": keyword, "apiKey": self.news_api_key}
+        news_data = self.http.get(self.news_api_url, params=params, timeout=DEFAULT_TIMEOUT).json()
+        if "articles" not in news_data:
+            return None
+        return news_data["articles"][:self.articles_per_keyword]
+
+    def ingest_articles(self, articles):
+        """ Scores and stores raw articles in one batch; returns their summary lines """
+        contents = [article["description"] or "No content available." for article in articles]
+        summaries, entries = [], []
+        for article, content, (sentiment, confidence) in zip(articles, contents, self.sentiment.analyze_batch(contents)):
+            title = article["title"]
+            source = article["source"]["name"]
+            bias = self.detect_bias(source)
+            entries.append(self.news_entry(title, content, source, sentiment, confidence, bias))
+            summaries.append(f"{title} (Sentiment: {sentiment}, Confidence: {confidence}%, Bias: {bias})")
+        self.save_news_batch(entries)  # One rewrite of news_file per fetch
+        return summaries
+
     def fetch_latest_news(self, keyword="technology"):
         """ Fetches real-time news from an API and ranks it """
-        API_URL = f"https://newsapi.org/v2/everything?q={keyword}&apiKey=YOUR_NEWS_API_KEY"
         try:
-            response = requests.get(API_URL, timeout=10)
-            news_data = response.json()
-
-            if "articles" in news_data:
-                top_articles = news_data["articles"][:5]
-                summaries = []
-                for article in top_articles:
-                    title = article["title"]
-                    content = article["description"] or "No content available."
-                    source = article["source"]["name"]
-                    sentiment, confidence = self.analyze_sentiment(content)
-                    bias = self.detect_bias(source)
-                    self.save_news(title, content, source, sentiment, confidence, bias)
-                    summaries.append(f"{title} (Sentiment: {sentiment}, Confidence: {confidence}%, Bias: {bias})")
-                return "📰 Latest News:\n" + "\n".join(summaries)
-            else:
+            articles = self.fetch_articles(keyword)
+            if articles is None:
                 return "⚠️ Failed to fetch news."
-        except requests.exceptions.RequestException as e:
+            return "📰 Latest News:\n" + "\n".join(self.ingest_articles(articles))
+        except (requests.exceptions.RequestException, ValueError) as e:
             return f"❌ News Fetching Error: {e}"
 
+    def fetch_many(self, keywords):
+        """ Fetches several keywords concurrently and stores the merged, de-duplicated articles """
+        keywords = list(dict.fromkeys(k.strip() for k in keywords if k.strip()))
+        if not keywords:
+            return "⚠️ FETCH_MANY needs at least one keyword."
+
+        def fetch(keyword):
+            try:
+                return self.fetch_articles(keyword), None
+            except (requests.exceptions.RequestException, ValueError) as e:
+                return None, e
+
+        articles, seen, failures = [], set(), []
+        for keyword, (found, error) in zip(keywords, self.fetch_pool.map(fetch, keywords)):
+            if found is None:
+                failures.append(f"⚠️ {keyword}: {error or 'Failed to fetch news.'}")
+                continue
+            for article in found:
+                # The same story often comes back for several keywords
+                keys = {article.get("url"), (article.get("title") or "").strip().lower()} - {None, ""}
+                if keys & seen:
+                    continue
+                seen |= keys
+                articles.append(article)
+        summaries = self.ingest_articles(articles) if articles else []
+        header = f"📰 Latest News for {', '.join(keywords)} ({len(summaries)} unique articles):"
+        return "\n".join([header] + summaries + failures)
+
     def analyze_sentiment(self, text):
         """ Analyzes sentiment & assigns a confidence score """
-        analysis = TextBlob(text)
-        polarity = analysis.sentiment.polarity
-        confidence = round(abs(polarity) * 100, 2)
-        if polarity > 0:
-            return "Positive", confidence
-        elif polarity < 0:
-            return "Negative", confidence
-        else:
-            return "Neutral", confidence
+        return self.sentiment.analyze(text)
+
+    def analyze_sentiment_batch(self, payload):
+        """ Scores many texts in one request: a JSON array of strings, or one text per line """
+        try:
+            texts = json.loads(payload) if payload.startswith("[") else [line for line in payload.splitlines() if line.strip()]
+        except ValueError as e:
+            return f"⚠️ Invalid ANALYZE_SENTIMENT payload: {e}"
+        if not texts or not all(isinstance(text, str) for text in texts):
+            return "⚠️ ANALYZE_SENTIMENT needs one or more texts."
+        results = self.sentiment.analyze_batch(texts)
+        return json.dumps([{"sentiment": label, "confidence": confidence} for label, confidence in results])
+
+    def detect_bias(self, source):
+        """ Labels an outlet's known editorial lean; unknown sources stay "Unknown" """
+        return self.source_bias.get((source or "").lower(), "Unknown")
 
     # ========================== NEWS AI SERVER ==========================
     def start(self):
         """ Starts the News AI for real-time news retrieval """
         server_thread = threading.Thread(target=self._server_loop, daemon=True)
         server_thread.start()
+        if self.stream_keywords:
+            self.stream.start(self.stream_keywords)
         print("\n📰 News AI is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Handles incoming news requests via sockets """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                    thread.start()
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
-    def handle_connection(self, conn):
+    def handle_message(self, message):
         """ Processes news and trend queries """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                if message.startswith("FETCH"):
-                    response = self.fetch_latest_news(message.replace("FETCH:", "").strip())
-                elif message.startswith("RECALL"):
-                    response = self.recall_news(message.replace("RECALL:", "").strip())
-                else:
-                    response = "⚠️ Invalid command. Use FETCH, RECALL."
-                conn.sendall(response.encode())
-        except Exception as e:
-            print(f"⚠️ Connection Error: {e}")
+        if message.startswith("ANALYZE_SENTIMENT"):
+            response = self.analyze_sentiment_batch(message.replace("ANALYZE_SENTIMENT:", "", 1).strip())
+        elif message.startswith("SENTIMENT_SUMMARY"):
+            response = self.sentiment_summary(message.replace("SENTIMENT_SUMMARY:", "", 1).strip())
+        elif message.startswith("STREAM_START"):
+            keywords = [k.strip() for k in message.replace("STREAM_START:", "", 1).split(",") if k.strip()]
+            self.stream.start(keywords)
+            response = f"📡 News stream polling: {', '.join(sorted(self.stream.keywords)) or 'no keywords yet'}."
+        elif message.startswith("STREAM_STOP"):
+            self.stream.stop()
+            response = "🛑 News stream stopped."
+        elif message.startswith("STREAM_STATS"):
+            response = json.dumps(self.stream.stats(), indent=4)
+        elif message.startswith("CACHE_STATS"):
+            response = json.dumps(self.cache.stats(), indent=4)
+        elif message.startswith("FETCH_MANY"):
+            response = self.fetch_many(message.replace("FETCH_MANY:", "", 1).split(","))
+        elif message.startswith("FETCH"):
+            response = self.fetch_latest_news(message.replace("FETCH:", "").strip())
+        elif message.startswith("RECALL"):
+            response = self.recall_news(message.replace("RECALL:", "").strip())
+        else:
+            response = "⚠️ Invalid command. Use FETCH, FETCH_MANY, RECALL, ANALYZE_SENTIMENT, SENTIMENT_SUMMARY, STREAM_START, STREAM_STOP, STREAM_STATS, CACHE_STATS."
+        return response
 
     def stop(self):
         """ Stops the AI """
         self.running = False
+        self.stream.stop()
+        self.sentiment.close()
+        self.fetch_pool.shutdown(wait=False)
+        self.http.close()
         print("🛑 News AI has been stopped.")
 
 # ========================== NEWS AI INITIALIZATION ==========================
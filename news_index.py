@@ -0,0 +1,66 @@
+import heapq
+import math
+from collections import Counter
+from memory_index import tokenize
+
+
+class BM25Index:
+    """ Incremental BM25 full-text index over multi-field documents
+
+    Each field's term counts are scaled by its weight (a title hit counts more
+    than a content hit) and summed into one weighted term frequency per
+    document, then scored with Okapi BM25. Postings are kept per term, so a
+    query only touches documents containing at least one of its terms.
+    """
+
+    def __init__(self, field_weights=None, k1=1.2, b=0.75):
+        self.field_weights = field_weights or {"title": 2.0, "content": 1.0, "source": 1.0}
+        self.k1 = k1
+        self.b = b
+        self.postings = {}  # term -> {doc_id: weighted term frequency}
+        self.doc_terms = {}  # doc_id -> terms, for removal
+        self.lengths = {}  # doc_id -> weighted document length
+        self.total_length = 0.0
+
+    def add(self, doc_id, document):
+        """ Indexes the weighted fields of a document dict under doc_id """
+        frequencies = Counter()
+        for field, weight in self.field_weights.items():
+            for term in tokenize(document.get(field) or ""):
+                frequencies[term] += weight
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+        self.doc_terms[doc_id] = list(frequencies)
+        length = sum(frequencies.values())
+        self.lengths[doc_id] = length
+        self.total_length += length
+
+    def remove(self, doc_id):
+        for term in self.doc_terms.pop(doc_id, ()):
+            docs = self.postings[term]
+            del docs[doc_id]
+            if not docs:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(doc_id, 0.0)
+
+    def clear(self):
+        self.postings, self.doc_terms, self.lengths, self.total_length = {}, {}, {}, 0.0
+
+    def search(self, query, k=10, accept=None):
+        """ Returns [(doc_id, score)] best first; `accept(doc_id)` filters candidates before ranking """
+        count = len(self.lengths)
+        if not count:
+            return []
+        average = self.total_length / count or 1.0
+        scores = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, frequency in docs.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        if accept is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if accept(doc_id)}
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,168 @@
+import hashlib
+import itertools
+import random
+import threading
+import time
+
+
+class RollingDedup:
+    """ Remembers roughly the last `capacity` article keys in two rotating hash sets
+
+    Keys go into the current generation; when it holds capacity/2 keys the
+    previous generation is dropped and the current one takes its place. Memory
+    stays bounded and anything seen within the last capacity/2 keys is caught.
+    Keys are stored as 8-byte digests rather than full URLs and titles.
+    """
+
+    def __init__(self, capacity=100000):
+        self.generation_size = max(1, capacity // 2)
+        self.current = set()
+        self.previous = set()
+
+    def seen(self, *keys):
+        """ Records the keys; returns True if any of them was seen before """
+        digests = {hashlib.blake2b(key.encode(), digest_size=8).digest() for key in keys if key}
+        if digests & self.current or digests & self.previous:
+            self.current |= digests
+            return True
+        self.current |= digests
+        if len(self.current) >= self.generation_size:
+            self.previous, self.current = self.current, set()
+        return False
+
+
+class NewsStream:
+    """ Background ingester that keeps polling NewsAI's keywords
+
+    Each cycle runs the due keywords through a generator pipeline:
+    fetch -> dedup -> sentiment and bias scoring (in batches) -> store. Items
+    flow one at a time, so a cycle holds at most one scoring batch in memory.
+    Keywords are polled every `interval` seconds with +/-10% jitter; a keyword
+    whose fetch fails backs off exponentially, with jitter, up to `max_backoff`.
+    """
+
+    def __init__(self, news_ai, interval=300.0, max_backoff=3600.0, batch_size=32, dedup_capacity=100000):
+        self.news_ai = news_ai
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.dedup = RollingDedup(dedup_capacity)
+        self.keywords = {}  # keyword -> {"due": monotonic time, "failures": n}
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.running = False
+        self.started = None
+        self.counters = {"polls": 0, "poll_errors": 0, "fetched": 0, "duplicates": 0, "scored": 0, "stored": 0}
+
+    # ========================== CONTROL ==========================
+    def start(self, keywords=()):
+        """ Adds keywords (polled right away) and starts the ingester thread if needed """
+        with self.lock:
+            for keyword in keywords:
+                self.keywords.setdefault(keyword, {"due": time.monotonic(), "failures": 0})
+            if not self.running:
+                self.running = True
+                self.started = time.monotonic()
+                self.thread = threading.Thread(target=self._run, name="NewsStream", daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+        self.wakeup.set()
+
+    def stats(self):
+        """ Per-stage counts and items per second since the stream started """
+        with self.lock:
+            uptime = time.monotonic() - self.started if self.started else 0.0
+            return {
+                "running": self.running,
+                "keywords": sorted(self.keywords),
+                **self.counters,
+                "rates_per_s": {stage: round(self.counters[stage] / uptime, 3) if uptime else 0.0
+                                for stage in ("fetched", "scored", "stored")},
+            }
+
+    def _count(self, stage, amount=1):
+        with self.lock:
+            self.counters[stage] += amount
+
+    # ========================== SCHEDULING ==========================
+    def _run(self):
+        while self.running:
+            with self.lock:
+                now = time.monotonic()
+                due = [k for k, state in self.keywords.items() if state["due"] <= now]
+                next_due = min((state["due"] for state in self.keywords.values()), default=now + self.interval)
+            if due:
+                try:
+                    self.run_cycle(due)
+                except Exception as e:
+                    print(f"❌ News Stream Error: {e}")
+                continue
+            self.wakeup.wait(max(0.0, next_due - now))
+            self.wakeup.clear()
+
+    def _reschedule(self, keyword, ok):
+        with self.lock:
+            state = self.keywords.get(keyword)
+            if state is None:
+                return
+            if ok:
+                state["failures"] = 0
+                delay = self.interval * random.uniform(0.9, 1.1)
+            else:
+                state["failures"] += 1
+                backoff = min(self.max_backoff, self.interval * 2 ** state["failures"])
+                delay = random.uniform(backoff / 2, backoff)  # Jitter keeps failing keywords from retrying in lockstep
+            state["due"] = time.monotonic() + delay
+
+    # ========================== PIPELINE ==========================
+    def run_cycle(self, keywords):
+        """ Pushes one poll of `keywords` through the pipeline; returns how many articles were stored """
+        stored = 0
+        for batch in self._scored(self._fresh(self._fetched(keywords))):
+            admitted = self.news_ai.save_news_batch(batch)
+            stored += admitted
+            self._count("stored", admitted)  # Articles below the retention cut are scored but not kept
+        return stored
+
+    def _fetched(self, keywords):
+        for keyword in keywords:
+            self._count("polls")
+            try:
+                articles = self.news_ai.fetch_articles(keyword)
+            except Exception:
+                articles = None
+            self._reschedule(keyword, articles is not None)
+            if articles is None:
+                self._count("poll_errors")
+                continue
+            for article in articles:
+                self._count("fetched")
+                yield article
+
+    def _fresh(self, articles):
+        for article in articles:
+            if self.dedup.seen(article.get("url") or "", (article.get("title") or "").strip().lower()):
+                self._count("duplicates")
+                continue
+            yield article
+
+    def _scored(self, articles):
+        """ Scores sentiment a batch at a time and yields lists of ready-to-store entries """
+        while True:
+            batch = list(itertools.islice(articles, self.batch_size))
+            if not batch:
+                return
+            contents = [article.get("description") or "No content available." for article in batch]
+            sentiments = self.news_ai.sentiment.analyze_batch(contents)
+            entries = []
+            for article, content, (sentiment, confidence) in zip(batch, contents, sentiments):
+                source = (article.get("source") or {}).get("name") or "Unknown"
+                entries.append(self.news_ai.news_entry(article.get("title") or "", content, source,
+                                                       sentiment, confidence, self.news_ai.detect_bias(source)))
+            self._count("scored", len(entries))
+            yield entries
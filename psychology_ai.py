@@ -1,10 +1,10 @@
-import socket
 import json
 import os
 import threading
 from datetime import datetime
+from async_server import AsyncBotServer
 
-class PsychologyAI:
+class PsychologyAI(AsyncBotServer):
     def __init__(self, host='localhost', port=7076):
         self.host = host
         self.port = port
@@ -58,33 +58,15 @@ class PsychologyAI:
         server_thread.start()
         print("\n🧠 Psychology AI is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Handles incoming psychology-related analysis requests """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                    thread.start()
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
-    def handle_connection(self, conn):
+    def handle_message(self, message):
         """ Processes psychology-related analysis requests """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                if message.startswith("THINKER"):
-                    response = "Analyzing with different psychological perspectives..."
-                elif message.startswith("RECALL"):
-                    response = self.recall_analysis()
-                else:
-                    response = "⚠️ Invalid command."
-                conn.sendall(response.encode())
-        except Exception as e:
-            print(f"⚠️ Connection Error: {e}")
+        if message.startswith("THINKER"):
+            response = "Analyzing with different psychological perspectives..."
+        elif message.startswith("RECALL"):
+            response = self.recall_analysis()
+        else:
+            response = "⚠️ Invalid command."
+        return response
 
     def stop(self):
         """ Gracefully stops the Psychology AI """
@@ -0,0 +1,110 @@
+import os
+import re
+import threading
+import numpy as np
+
+TICK = np.dtype([("timestamp", "<f8"), ("price", "<f8"), ("volume", "<f8"), ("change", "<f8")])
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9.^=-]{1,16}$")
+
+
+class SymbolHistory:
+    """ Fixed-depth ring buffer of ticks for one symbol, backed by a memory-mapped .npy file
+
+    Ticks are appended in increasing timestamp order, so the file describes
+    itself: unused rows have timestamp 0 and, once the ring has wrapped, the
+    newest row is the one with the largest timestamp. No separate metadata
+    has to be kept in sync with the data.
+    """
+
+    def __init__(self, path, depth):
+        if os.path.exists(path):
+            ticks = np.load(path, mmap_mode="r+")
+            if len(ticks) != depth:
+                ticks = self._resize(path, ticks, depth)
+        else:
+            ticks = np.lib.format.open_memmap(path, mode="w+", dtype=TICK, shape=(depth,))
+        self.ticks = ticks
+        self.depth = depth
+        timestamps = ticks["timestamp"]
+        self.size = int(np.count_nonzero(timestamps))
+        self.head = self.size if self.size < depth else (int(np.argmax(timestamps)) + 1) % depth
+
+    @staticmethod
+    def _resize(path, ticks, depth):
+        """ Rewrites the file at a new depth, keeping the newest ticks """
+        filled = ticks[ticks["timestamp"] > 0]
+        newest = np.sort(filled, order="timestamp")[-depth:]
+        resized = np.lib.format.open_memmap(path + ".tmp", mode="w+", dtype=TICK, shape=(depth,))
+        resized[:len(newest)] = newest
+        resized.flush()
+        del resized
+        os.replace(path + ".tmp", path)
+        return np.load(path, mmap_mode="r+")
+
+    @property
+    def last_timestamp(self):
+        return float(self.ticks["timestamp"][(self.head - 1) % self.depth]) if self.size else 0.0
+
+    def append(self, timestamp, price, volume, change):
+        """ Adds a tick; returns False for a tick that is not newer than the last one (e.g. a cached quote) """
+        if timestamp <= self.last_timestamp:
+            return False
+        self.ticks[self.head] = (timestamp, price, volume, change)
+        self.head = (self.head + 1) % self.depth
+        self.size = min(self.size + 1, self.depth)
+        return True
+
+    def segments(self):
+        """ The filled rows in chronological order, as at most two views """
+        if self.size < self.depth:
+            return [self.ticks[:self.size]]
+        return [self.ticks[self.head:], self.ticks[:self.head]]
+
+    def range(self, start=None, end=None):
+        """ Ticks with start <= timestamp <= end, oldest first, as one structured array """
+        parts = []
+        for segment in self.segments():
+            timestamps = segment["timestamp"]
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, "left"))
+            hi = len(segment) if end is None else int(np.searchsorted(timestamps, end, "right"))
+            if hi > lo:
+                parts.append(segment[lo:hi])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=TICK)
+
+
+class QuoteHistory:
+    """ Per-symbol tick history for TradingAI, one ring buffer file per symbol """
+
+    def __init__(self, directory, depth=10000):
+        self.directory = directory
+        self.depth = depth  # Ticks kept per symbol
+        self.series = {}
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _series(self, symbol, create):
+        symbol = symbol.upper()
+        series = self.series.get(symbol)
+        if series is None:
+            if not SYMBOL_PATTERN.match(symbol):
+                raise ValueError(f"Invalid symbol: {symbol!r}")
+            path = os.path.join(self.directory, f"{symbol}.npy")
+            if not create and not os.path.exists(path):
+                return None
+            series = self.series[symbol] = SymbolHistory(path, self.depth)
+        return series
+
+    def append(self, symbol, timestamp, price, volume, change):
+        with self.lock:
+            return self._series(symbol, True).append(timestamp, price, volume, change)
+
+    def range(self, symbol, start=None, end=None):
+        """ Returns the ticks in [start, end] (epoch seconds, either may be None), or None for an unknown symbol """
+        with self.lock:
+            series = self._series(symbol, False)
+            return series.range(start, end) if series is not None else None
+
+    def flush(self):
+        with self.lock:
+            for series in self.series.values():
+                series.ticks.flush()
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """ An upstream load in progress that identical requests wait on """
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """ TTL + LRU cache for upstream API responses, with single-flight loading
+
+    `get_or_load(key, loader)` returns a fresh cached value if there is one.
+    Otherwise the first caller runs `loader()` and every concurrent caller for
+    the same key waits for that one result instead of calling upstream again.
+    Errors are shared with the waiters but never cached, and neither is a
+    None result, so failed or empty upstream answers are retried next time.
+    """
+
+    def __init__(self, max_entries=1024, ttl=30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl  # Default seconds a value stays fresh; overridable per key
+        self._entries = OrderedDict()  # key -> (expires, value), least recently used first
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "coalesced": 0, "expired": 0, "evicted": 0, "errors": 0}
+
+    def get_or_load(self, key, loader, ttl=None):
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.counters["misses"] += 1
+            else:
+                self.counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is not None:
+                    self.counters["errors"] += 1
+                elif flight.value is not None:
+                    self._store(key, flight.value, self.ttl if ttl is None else ttl)
+            flight.done.set()
+        return flight.value
+
+    def get(self, key):
+        """ Returns the fresh cached value or None, counting a miss; for callers that load misses in batches and put() them """
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.counters["misses"] += 1
+            return value
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry[1]
+            del self._entries[key]
+            self.counters["expired"] += 1
+        return None
+
+    def _store(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evicted"] += 1
+
+    def put(self, key, value, ttl=None):
+        """ Stores a value fetched outside get_or_load (e.g. as part of a batch call) """
+        if value is not None:
+            with self._lock:
+                self._store(key, value, self.ttl if ttl is None else ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Returns the counters plus current size and hit rate (coalesced waits count as hits) """
+        with self._lock:
+            served = self.counters["hits"] + self.counters["coalesced"]
+            requests = served + self.counters["misses"]
+            return {
+                "entries": len(self._entries),
+                **self.counters,
+                "hit_rate": round(served / requests, 4) if requests else 0.0,
+            }
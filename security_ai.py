@@ -1,7 +1,15 @@
-import socket
+import itertools
+import json
 import threading
+import time
+from connection_pool import default_pool
+from async_server import AsyncBotServer
+from security_rules import RULES_FILE, RuleEngine, SEVERITY_RANK, StreamScanner
+
+class SecurityAI(AsyncBotServer):
+    inline_commands = ("SCAN:",)  # A short message is one cheap compiled-regex pass; long ones use the executor
+    request_timeout = 900.0  # SCAN_FILE over a multi-GB file runs for minutes
 
-class SecurityAI:
     def __init__(self, host='localhost', port=7082):  # Fixed Port
         self.host = host
         self.port = port
@@ -22,14 +30,100 @@ class SecurityAI:
             "network_ai": 7087  # Fixed
         }
 
+        # Rules are reloaded when this file changes; without it the built-in defaults apply
+        self.rules = RuleEngine(RULES_FILE)
+
+        # Bulk scans read this many characters at a time; open SCAN_STREAM sessions expire when idle
+        self.scan_chunk_size = 1 << 20
+        self.stream_idle_timeout = 300.0
+        self.streams = {}  # stream id -> {"scanner", "lock", "touched"}
+        self.stream_ids = itertools.count(1)
+        self.streams_lock = threading.Lock()
+
     # ========================== SECURITY SCANNING ==========================
     def scan_message(self, message):
-        """ Checks for possible security risks in code or commands """
-        risky_keywords = ["rm -rf", "DROP TABLE", "shutdown", "sudo", "chmod 777", "wget"]
-        for keyword in risky_keywords:
-            if keyword in message.lower():
-                return f"⚠️ Security Alert: Potential dangerous command detected: {keyword}"
-        return "✅ Security Check: No issues found."
+        """ Checks for possible security risks in code or commands, reporting every match """
+        return self.format_findings(self.rules.scan(message))
+
+    @staticmethod
+    def format_findings(findings):
+        """ Formats findings as an alert line followed by the JSON list of matches """
+        if not findings:
+            return "✅ Security Check: No issues found."
+        highest = max((f["severity"] for f in findings), key=SEVERITY_RANK.get)
+        names = ", ".join(dict.fromkeys(f["rule"] for f in findings))
+        return (f"⚠️ Security Alert: {len(findings)} potential dangerous pattern(s) detected "
+                f"(highest severity: {highest}): {names}\n{json.dumps(findings)}")
+
+    # ========================== BULK SCANNING ==========================
+    def scan_file(self, path):
+        """ Scans a file of any size chunk by chunk and returns the aggregated report """
+        scanner = StreamScanner(self.rules.current())
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace", newline="") as file:
+                while True:
+                    chunk = file.read(self.scan_chunk_size)
+                    if not chunk:
+                        break
+                    scanner.feed(chunk)
+        except OSError as e:
+            return f"❌ Could not scan {path}: {e}"
+        scanner.feed("", final=True)
+        return self.format_report(path, scanner.report())
+
+    def open_stream(self):
+        """ Starts a SCAN_STREAM session; its chunks are scanned as one continuous text """
+        with self.streams_lock:
+            now = time.monotonic()
+            for stream_id in [i for i, s in self.streams.items() if now - s["touched"] > self.stream_idle_timeout]:
+                del self.streams[stream_id]
+            stream_id = str(next(self.stream_ids))
+            self.streams[stream_id] = {"scanner": StreamScanner(self.rules.current()),
+                                       "lock": threading.Lock(), "touched": now}
+        return f"🔒 Scan stream {stream_id} opened."
+
+    def feed_stream(self, stream_id, chunk):
+        with self.streams_lock:
+            stream = self.streams.get(stream_id)
+        if stream is None:
+            return f"⚠️ Unknown or expired scan stream: {stream_id}"
+        with stream["lock"]:
+            stream["scanner"].feed(chunk)
+            stream["touched"] = time.monotonic()
+            return f"🔒 Scan stream {stream_id}: {stream['scanner'].length} characters scanned."
+
+    def close_stream(self, stream_id):
+        with self.streams_lock:
+            stream = self.streams.pop(stream_id, None)
+        if stream is None:
+            return f"⚠️ Unknown or expired scan stream: {stream_id}"
+        with stream["lock"]:
+            stream["scanner"].feed("", final=True)
+            return self.format_report(f"scan stream {stream_id}", stream["scanner"].report())
+
+    def handle_stream(self, command):
+        """ SCAN_STREAM:OPEN, SCAN_STREAM:DATA:<id>:<text> and SCAN_STREAM:CLOSE:<id>
+
+        The server strips whitespace from the ends of every request, so a chunk
+        should not end in whitespace that a pattern might need (split mid-line).
+        """
+        action, _, rest = command.partition(":")
+        if action == "OPEN":
+            return self.open_stream()
+        if action == "DATA":
+            stream_id, _, chunk = rest.partition(":")
+            return self.feed_stream(stream_id.strip(), chunk)
+        if action == "CLOSE":
+            return self.close_stream(rest.strip())
+        return "⚠️ Use SCAN_STREAM:OPEN, SCAN_STREAM:DATA:<id>:<text> or SCAN_STREAM:CLOSE:<id>."
+
+    @staticmethod
+    def format_report(source, report):
+        """ Formats a bulk scan report as a summary line followed by the full report as JSON """
+        if not report["total_findings"]:
+            return f"✅ Security Check: No issues found in {source} ({report['scanned_chars']} characters scanned)."
+        return (f"⚠️ Security Alert: {report['total_findings']} potential dangerous pattern(s) detected in {source} "
+                f"(highest severity: {report['highest_severity']})\n{json.dumps(report)}")
 
     # ========================== NETWORK COMMUNICATION ==========================
     def send_message(self, target_bot, message):
@@ -39,11 +133,7 @@ class SecurityAI:
 
         target_port = self.neural_bots[target_bot]
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect(("localhost", target_port))
-                s.sendall(message.encode())
-                response = s.recv(1024).decode()
-                return response
+            return default_pool.request("localhost", target_port, message)
         except Exception as e:
             return f"❌ Error communicating with {target_bot}: {e}"
 
@@ -54,31 +144,19 @@ class SecurityAI:
         server_thread.start()
         print("\n🔒 Security AI is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Handles security requests via socket communication """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                    thread.start()
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
-    def handle_connection(self, conn):
+    def handle_message(self, message):
         """ Processes incoming security scan requests """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                if message.startswith("SCAN"):
-                    response = self.scan_message(message.replace("SCAN:", "").strip())
-                else:
-                    response = "⚠️ Invalid command. Use SCAN."
-                conn.sendall(response.encode())
-        except Exception as e:
-            print(f"⚠️ Connection Error: {e}")
+        if message.startswith("SCAN_FILE:"):
+            response = self.scan_file(message[len("SCAN_FILE:"):].strip())
+        elif message.startswith("SCAN_STREAM:"):
+            response = self.handle_stream(message[len("SCAN_STREAM:"):])
+        elif message.startswith("SCAN"):
+            response = self.scan_message(message.replace("SCAN:", "").strip())
+        elif message.startswith("RELOAD_RULES"):
+            response = self.rules.reload()
+        else:
+            response = "⚠️ Invalid command. Use SCAN, SCAN_FILE, SCAN_STREAM or RELOAD_RULES."
+        return response
 
     def stop(self):
         """ Gracefully stops the Security AI """
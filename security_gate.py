@@ -0,0 +1,91 @@
+import hashlib
+import json
+import re
+import threading
+from connection_pool import default_pool
+from response_cache import ResponseCache
+from security_rules import RULES_FILE, RuleEngine, SEVERITY_RANK
+
+
+class SecurityGate:
+    """ In-process security check for payloads before the brain dispatches them
+
+    Runs SecurityAI's compiled rules (same rule file, hot-reloaded) locally, so
+    a command is vetted without a socket round trip. Verdicts are kept in a
+    ResponseCache (LRU, no expiry) keyed by a 16-byte blake2b digest of the
+    payload, and the cache is cleared whenever the rules change. A payload of at least `remote_threshold`
+    characters that misses the cache is scanned by SecurityAI over a
+    SCAN_STREAM session instead, so a large scan does not tie up the brain; if
+    SecurityAI cannot be reached it is scanned locally after all.
+
+    A payload is blocked when its most severe finding reaches `block_severity`.
+    """
+
+    def __init__(self, rules=None, security_ai=("localhost", 7082), cache_size=4096,
+                 remote_threshold=256 * 1024, block_severity="high", remote_timeout=30.0):
+        self.rules = rules or RuleEngine(RULES_FILE)
+        self.security_ai = security_ai
+        self.remote_threshold = remote_threshold
+        self.block_rank = SEVERITY_RANK[block_severity]
+        self.remote_timeout = remote_timeout
+        self.cache = ResponseCache(max_entries=cache_size, ttl=float("inf"))  # Payload digest -> verdict
+        self.ruleset = None  # The rule set the cached verdicts were made with
+        self.lock = threading.Lock()  # Held to swap rule sets, so no verdict from older rules is stored after a clear
+        self.counters = {"blocked": 0, "remote_scans": 0, "remote_errors": 0}
+
+    def check(self, payload):
+        """ Returns the verdict for a payload as {"allowed", "severity", "rules"} """
+        ruleset = self.rules.current()
+        key = hashlib.blake2b(payload.encode(), digest_size=16).digest()
+        with self.lock:
+            if ruleset is not self.ruleset:
+                self.cache.clear()
+                self.ruleset = ruleset
+        verdict = self.cache.get(key)
+        if verdict is not None:
+            with self.lock:
+                self.counters["blocked"] += not verdict["allowed"]
+            return verdict
+
+        report = self._remote_scan(payload) if len(payload) >= self.remote_threshold else None
+        if report is not None:
+            severity, rules = report["highest_severity"], sorted(report["by_rule"])
+        else:
+            findings = ruleset.scan(payload)
+            severity = max((f["severity"] for f in findings), key=SEVERITY_RANK.get) if findings else None
+            rules = sorted({f["rule"] for f in findings})
+        verdict = {"allowed": severity is None or SEVERITY_RANK[severity] < self.block_rank,
+                   "severity": severity, "rules": rules}
+
+        with self.lock:
+            if ruleset is self.ruleset:
+                self.cache.put(key, verdict)
+            self.counters["blocked"] += not verdict["allowed"]
+        return verdict
+
+    def _remote_scan(self, payload):
+        """ Has SecurityAI scan a large payload; returns its report, or None if that failed """
+        host, port = self.security_ai
+        try:
+            opened = default_pool.request(host, port, "SCAN_STREAM:OPEN", timeout=self.remote_timeout)
+            stream_id = re.search(r"stream (\d+)", opened).group(1)
+            default_pool.request(host, port, f"SCAN_STREAM:DATA:{stream_id}:{payload}", timeout=self.remote_timeout)
+            reply = default_pool.request(host, port, f"SCAN_STREAM:CLOSE:{stream_id}", timeout=self.remote_timeout)
+            if reply.startswith("✅"):
+                report = {"highest_severity": None, "by_rule": {}}
+            elif reply.startswith("⚠️ Security Alert"):
+                report = json.loads(reply.split("\n", 1)[1])
+            else:
+                raise ValueError(reply)
+        except Exception:
+            with self.lock:
+                self.counters["remote_errors"] += 1
+            return None
+        with self.lock:
+            self.counters["remote_scans"] += 1
+        return report
+
+    def stats(self):
+        """ Returns the verdict cache's stats plus the gate's counters """
+        with self.lock:
+            return {**self.cache.stats(), **self.counters}
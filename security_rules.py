@@ -0,0 +1,290 @@
+import json
+import os
+import re
+import threading
+import time
+
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+RULES_FILE = "/workspace/ai_project/security_rules.json"  # Shared by SecurityAI and the brain's security gate
+
+# Used when no rule file exists. Literal patterns match case-insensitively and any
+# run of whitespace matches a space; "regex": true patterns are used as written.
+DEFAULT_RULES = [
+    {"name": "recursive-delete", "pattern": "rm -rf", "severity": "critical"},
+    {"name": "recursive-delete", "pattern": "rm -fr", "severity": "critical"},
+    {"name": "drop-table", "pattern": "drop table", "severity": "critical"},
+    {"name": "drop-database", "pattern": "drop database", "severity": "critical"},
+    {"name": "filesystem-format", "pattern": r"\bmkfs(?:\.\w+)?\b", "severity": "critical", "regex": True},
+    {"name": "raw-disk-write", "pattern": r"\bdd\s+if=.*\bof=/dev/", "severity": "critical", "regex": True},
+    {"name": "fork-bomb", "pattern": ":(){ :|:& };:", "severity": "critical"},
+    {"name": "pipe-to-shell", "pattern": r"\bcurl\b[^|\n]*\|\s*(?:sudo\s+)?(?:ba|z)?sh\b", "severity": "high", "regex": True},
+    {"name": "pipe-to-shell", "pattern": r"\bwget\b[^|\n]*\|\s*(?:sudo\s+)?(?:ba|z)?sh\b", "severity": "high", "regex": True},
+    # The words alone are everyday English ("trading halt", "government shutdown"); as a command they take options
+    {"name": "shutdown", "pattern": r"\bshutdown\s+(?:-\w|now\b|\+?\d)", "severity": "high", "regex": True},
+    {"name": "shutdown", "pattern": r"\breboot\s+(?:-\w|now\b|\+?\d)", "severity": "high", "regex": True},
+    {"name": "shutdown", "pattern": r"\bhalt\s+(?:-\w|now\b|\+?\d)", "severity": "high", "regex": True},
+    {"name": "shutdown", "pattern": r"\bpoweroff\s+(?:-\w|now\b|\+?\d)", "severity": "high", "regex": True},
+    {"name": "shutdown-word", "pattern": r"\bshutdown\b", "severity": "medium", "regex": True},
+    {"name": "shutdown-word", "pattern": r"\breboot\b", "severity": "medium", "regex": True},
+    {"name": "shutdown-word", "pattern": r"\bhalt\b", "severity": "medium", "regex": True},
+    {"name": "shutdown-word", "pattern": r"\bpoweroff\b", "severity": "medium", "regex": True},
+    {"name": "privilege-escalation", "pattern": r"\bsudo\b", "severity": "high", "regex": True},
+    {"name": "world-writable", "pattern": "chmod 777", "severity": "medium"},
+    {"name": "remote-download", "pattern": r"\bwget\b", "severity": "medium", "regex": True},
+]
+
+
+# One literal character of a regex: a plain character or an escaped punctuation mark
+_PREFIX_ATOM = re.compile(r"\\[^A-Za-z0-9\s]|[A-Za-z0-9_\-/=:;,'\"<>@#%&~!]")
+
+
+def _top_level_alternation(pattern):
+    depth, in_class, i = 0, False, 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 1
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char in "()":
+            depth += 1 if char == "(" else -1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def _split_rule(rule):
+    """ Splits a rule into trie keys (regex atoms) for its literal prefix and the regex that must follow them
+
+    A literal rule is all prefix: its lowercased characters, with a run of
+    whitespace as one \\s+ key. For a regex rule the prefix is an optional
+    leading \\b plus the plain characters up to the first regex construct.
+    The \\b is moved behind the first character as a two-character lookbehind,
+    so every branch of the trie starts with a literal and the regex engine can
+    skip ahead to the positions where one of those first characters occurs.
+    """
+    pattern = rule["pattern"]
+    if not rule.get("regex"):
+        keys = [r"\s+" if char == " " else re.escape(char) for char in re.sub(r"\s+", " ", pattern.strip().lower())]
+        if not keys:
+            raise ValueError(f"Empty pattern in rule {rule.get('name')!r}")
+        return keys, ""
+    if _top_level_alternation(pattern):
+        return [], pattern
+    boundary = pattern.startswith(r"\b")
+    chars, pos = [], 2 if boundary else 0
+    while True:
+        atom = _PREFIX_ATOM.match(pattern, pos)
+        if atom is None or pattern[atom.end():atom.end() + 1] in ("?", "*", "+", "{"):
+            break  # A quantified character is not a fixed prefix
+        chars.append(atom.group()[-1].lower())
+        pos = atom.end()
+    keys = [re.escape(char) for char in chars]
+    if boundary and keys:
+        # \b before a word character means the one before it is not one, and vice versa
+        keys[0] += r"(?<!\w.)" if re.match(r"\w", chars[0]) else r"(?<=\w.)"
+    elif boundary:
+        keys = [r"\b"]
+    if not keys and not pattern[pos:]:
+        raise ValueError(f"Empty pattern in rule {rule.get('name')!r}")
+    return keys, pattern[pos:]
+
+
+class RuleSet:
+    """ Rules compiled into one case-insensitive regex that finds every match in a single pass
+
+    Every rule's literal prefix goes into one shared prefix trie, so at each
+    position the engine only follows the branches whose characters match
+    instead of trying the rules one by one. Below its prefix each rule ends in
+    its remaining regex (if any) and an empty marker group; the marker that
+    closed last tells which rule matched. Matches do not overlap. Where several
+    rules match at the same spot, longer prefixes win, then the more severe rule.
+
+    The trie is matched case-sensitively against lowercased text, which lets
+    the regex engine reject branches by their first character far faster than
+    IGNORECASE does; text whose length changes when lowercased falls back to
+    an IGNORECASE copy of the pattern.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        trie = {}
+        for rule in sorted(rules, key=lambda rule: -SEVERITY_RANK[rule["severity"]]):
+            keys, remainder = _split_rule(rule)
+            if remainder:
+                re.compile(remainder)  # Fail on the bad rule, not on the combined pattern
+            node = trie
+            for key in keys:
+                node = node.setdefault(key, {})
+            node.setdefault("", []).append((remainder, rule))
+
+        self.markers = {}  # Marker group number -> rule
+        group = 0
+
+        def build(node):
+            nonlocal group
+            branches = []
+            for key, child in sorted((key, child) for key, child in node.items() if key):
+                branches.append(key + build(child))
+            for remainder, rule in node.get("", ()):
+                if remainder:
+                    group += re.compile(remainder).groups
+                    remainder = f"(?i:{remainder})"
+                group += 1
+                self.markers[group] = rule
+                branches.append(remainder + "()")
+            return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+        pattern = build(trie) if rules else None
+        self.folded = re.compile(pattern) if rules else None
+        self.pattern = re.compile(pattern, re.IGNORECASE) if rules else None
+
+    def finditer(self, text, offset=0, pos=0):
+        """ Yields (rule, start, end, matched text) for every match at or after `pos`; offsets are shifted by `offset`
+
+        Text before `pos` is not matched but still gives context to \\b and lookbehinds.
+        """
+        if self.pattern is None:
+            return
+        markers = self.markers
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self.folded.finditer(lowered, pos)
+        else:
+            matches = self.pattern.finditer(text, pos)
+        for match in matches:
+            start, end = match.span()
+            yield markers[match.lastindex], start + offset, end + offset, text[start:end]
+
+    def scan(self, text):
+        """ Returns every finding as {rule, severity, start, end, match} """
+        return [{"rule": rule["name"], "severity": rule["severity"], "start": start, "end": end, "match": matched}
+                for rule, start, end, matched in self.finditer(text)]
+
+
+class StreamScanner:
+    """ Scans text that arrives in chunks, in constant memory, and aggregates the findings
+
+    Each feed scans the carried-over tail of the previous chunk plus the new
+    chunk. Matches that start in the last `overlap` characters are left for the
+    next feed, when more text may complete them. A few characters of
+    already-scanned text are kept in front of the tail as context for \\b. Only
+    the first `max_findings` findings are kept in full; counts cover them all.
+
+    `overlap` must be at least the longest match any rule can make: then the
+    findings are the same as one scan of the whole text, wherever the chunk
+    boundaries fall. Rules with open-ended parts (`.*`, `[^|\\n]*`) match up to
+    a whole line, so a longer line split across chunks can lose or shorten
+    such a match.
+    """
+
+    context = 64
+
+    def __init__(self, ruleset, overlap=4096, max_findings=1000):
+        self.ruleset = ruleset
+        self.overlap = overlap
+        self.max_findings = max_findings
+        self.buffer = ""
+        self.scan_from = 0  # Where in buffer scanning resumes (what comes before is context)
+        self.base = 0  # Offset of buffer[0] in the whole stream
+        self.base_line = 1  # Line number of buffer[0]
+        self.length = 0
+        self.findings = []
+        self.by_rule = {}
+        self.by_severity = {}
+
+    def feed(self, chunk, final=False):
+        """ Scans the next chunk of the stream; pass final=True (with or without a last chunk) to flush the tail """
+        text = self.buffer + chunk
+        self.length += len(chunk)
+        cut = len(text) if final else max(self.scan_from, len(text) - self.overlap)
+        resume = cut
+        for rule, start, end, matched in self.ruleset.finditer(text, 0, self.scan_from):
+            if start >= cut:
+                break
+            self.by_rule[rule["name"]] = self.by_rule.get(rule["name"], 0) + 1
+            self.by_severity[rule["severity"]] = self.by_severity.get(rule["severity"], 0) + 1
+            if len(self.findings) < self.max_findings:
+                self.findings.append({"rule": rule["name"], "severity": rule["severity"], "start": self.base + start,
+                                      "end": self.base + end, "line": self.base_line + text.count("\n", 0, start),
+                                      "match": matched})
+            resume = max(resume, end)  # Matches never overlap, so the next one starts after this
+        keep = max(0, resume - self.context)
+        self.base_line += text.count("\n", 0, keep)
+        self.base += keep
+        self.buffer = text[keep:]
+        self.scan_from = resume - keep
+
+    def report(self):
+        """ The aggregated findings for everything fed so far """
+        total = sum(self.by_rule.values())
+        return {
+            "scanned_chars": self.length,
+            "total_findings": total,
+            "highest_severity": max(self.by_severity, key=SEVERITY_RANK.get) if total else None,
+            "by_severity": self.by_severity,
+            "by_rule": self.by_rule,
+            "findings": self.findings,
+            "truncated": total > len(self.findings),
+        }
+
+
+class RuleEngine:
+    """ Hot-reloadable rule set backed by a JSON rule file
+
+    The file holds a list of {"name", "pattern", "severity", "regex"?} objects.
+    Its modification time is checked at most every `check_interval` seconds,
+    and a changed file is recompiled by the next scan. A file that fails to
+    parse or compile leaves the previous rules in force.
+    """
+
+    def __init__(self, path=None, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.ruleset = RuleSet(DEFAULT_RULES)
+        self.loaded_mtime = None
+        self.next_check = 0.0
+        self.reload()
+
+    def current(self):
+        """ The rule set in force, picking up rule file changes """
+        now = time.monotonic()
+        if self.path and now >= self.next_check:
+            self.next_check = now + self.check_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime != self.loaded_mtime:
+                self.reload()
+        return self.ruleset
+
+    def reload(self):
+        """ Recompiles the rules from the rule file (or the defaults if there is none); returns a status line """
+        with self.lock:
+            if not self.path or not os.path.exists(self.path):
+                self.ruleset, self.loaded_mtime = RuleSet(DEFAULT_RULES), None
+                return f"🔒 Loaded {len(DEFAULT_RULES)} default security rules."
+            mtime = os.stat(self.path).st_mtime_ns
+            try:
+                with open(self.path, "r") as file:
+                    rules = json.load(file)
+                for rule in rules:
+                    rule.setdefault("severity", "medium")
+                    if rule["severity"] not in SEVERITY_RANK:
+                        raise ValueError(f"Unknown severity {rule['severity']!r} in rule {rule.get('name')!r}")
+                    rule.setdefault("name", rule["pattern"])
+                self.ruleset = RuleSet(rules)
+                self.loaded_mtime = mtime
+                return f"🔒 Loaded {len(rules)} security rules from {self.path}."
+            except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+                self.loaded_mtime = mtime  # Do not retry until the file changes again
+                print(f"❌ Security rules not reloaded: {e}")
+                return f"❌ Security rules not reloaded, keeping the previous rules: {e}"
+
+    def scan(self, text):
+        return self.current().scan(text)
@@ -1,11 +1,11 @@
-import socket
 import os
 import json
 import threading
 import subprocess
 from datetime import datetime
+from async_server import AsyncBotServer
 
-class SelfAnalysisAI:
+class SelfAnalysisAI(AsyncBotServer):
     def __init__(self, host='localhost', port=7077):
         self.host = host
         self.port = port
@@ -90,31 +90,13 @@ class SelfAnalysisAI:
         server_thread.start()
         print("\n🧠 Self-Analysis AI is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Handles incoming self-analysis requests via sockets """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                    thread.start()
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
-    def handle_connection(self, conn):
+    def handle_message(self, message):
         """ Processes self-analysis and security requests """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                if message.startswith("ANALYZE"):
-                    response = self.analyze_code(message.replace("ANALYZE:", "").strip())
-                else:
-                    response = "⚠️ Invalid command. Use ANALYZE."
-                conn.sendall(response.encode())
-        except Exception as e:
-            print(f"⚠️ Connection Error: {e}")
+        if message.startswith("ANALYZE"):
+            response = self.analyze_code(message.replace("ANALYZE:", "").strip())
+        else:
+            response = "⚠️ Invalid command. Use ANALYZE."
+        return response
 
     def stop(self):
         """ Gracefully stops the AI """
@@ -0,0 +1,98 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from textblob import TextBlob
+from response_cache import ResponseCache
+
+
+def classify(polarity):
+    """ Maps a TextBlob polarity to NewsAI's (label, confidence %) pair """
+    confidence = round(abs(polarity) * 100, 2)
+    if polarity > 0:
+        return "Positive", confidence
+    elif polarity < 0:
+        return "Negative", confidence
+    else:
+        return "Neutral", confidence
+
+
+def score_text(text):
+    return classify(TextBlob(text).sentiment.polarity)
+
+
+def score_texts(texts):
+    """ Worker entry point: scores one chunk of texts """
+    return [score_text(text) for text in texts]
+
+
+def _warm_up():
+    # The first TextBlob analysis loads the lexicon; pay for it once per worker, not per request
+    score_text("warm up")
+
+
+class SentimentAnalyzer:
+    """ Batched sentiment scoring with a content-hash cache and a process pool
+
+    Cached and duplicate texts are answered without re-scoring. Small batches
+    of misses are scored in-process; larger ones are split into chunks across
+    worker processes, each of which warms TextBlob once at startup. The pool
+    uses the spawn start method because the bots fork from threaded servers.
+    """
+
+    def __init__(self, workers=None, cache_size=10000, min_parallel=32, chunk_size=64):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.min_parallel = min_parallel  # Fewer misses than this are cheaper to score locally
+        self.chunk_size = chunk_size
+        self.cache = ResponseCache(max_entries=cache_size, ttl=float("inf"))  # Content hash -> (label, confidence)
+        self.lock = threading.Lock()
+        self.pool = None
+        self.local_ready = False
+        self.stats = {"parallel_batches": 0}  # Hits and misses are in cache.stats()
+
+    def analyze(self, text):
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts):
+        """ Returns [(label, confidence)] in the order of `texts` """
+        keys = [hashlib.blake2b(text.encode(), digest_size=16).digest() for text in texts]
+        results, pending = {}, {}
+        for key, text in dict(zip(keys, texts)).items():
+            result = self.cache.get(key)
+            if result is None:
+                pending[key] = text
+            else:
+                results[key] = result
+        if pending:
+            scored = self._score(list(pending.values()))
+            results.update(zip(pending, scored))
+            for key, result in zip(pending, scored):
+                self.cache.put(key, result)
+        return [results[key] for key in keys]
+
+    def _score(self, texts):
+        if len(texts) < self.min_parallel or self.workers < 2:
+            if not self.local_ready:
+                _warm_up()
+                self.local_ready = True
+            return score_texts(texts)
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        with self.lock:
+            self.stats["parallel_batches"] += 1
+        return [result for chunk in self._pool().map(score_texts, chunks) for result in chunk]
+
+    def _pool(self):
+        with self.lock:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_warm_up
+                )
+            return self.pool
+
+    def close(self):
+        """ Shuts the worker processes down """
+        with self.lock:
+            pool, self.pool = self.pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,167 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class ScheduledTask:
+    """ One unit of work tracked by the TaskScheduler """
+    __slots__ = ("task_id", "payload", "priority", "deadline", "status", "result",
+                 "submitted", "started", "finished")
+
+    def __init__(self, task_id, payload, priority, deadline):
+        self.task_id = task_id
+        self.payload = payload
+        self.priority = priority
+        self.deadline = deadline  # Monotonic time after which the task is dropped unstarted
+        self.status = "queued"
+        self.result = None
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            "id": self.task_id,
+            "task": self.payload,
+            "priority": self.priority,
+            "status": self.status,
+            "result": self.result,
+            "wait_ms": round(((self.started or self.finished or time.monotonic()) - self.submitted) * 1000, 2),
+            "run_ms": round((self.finished - self.started) * 1000, 2) if self.finished and self.started else None,
+        }
+
+
+class TaskScheduler:
+    """ Priority work queue with a fixed worker pool, deadlines, cancellation and metrics
+
+    Lower priority numbers run first; equal priorities run in submission order.
+    Idle workers block on a condition variable instead of polling.
+    """
+
+    def __init__(self, handler, num_workers=6, max_finished=1000):
+        self.handler = handler
+        self.num_workers = num_workers
+        self._heap = []
+        self._sequence = itertools.count()
+        self._ids = itertools.count(1)
+        self._tasks = {}
+        self._finished = deque()  # Oldest finished task ids, trimmed to max_finished
+        self.max_finished = max_finished
+        self._condition = threading.Condition()
+        self._workers = []
+        self.running = False
+        self._queued_count = 0
+        self._running_count = 0
+        self._counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "expired": 0}
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    # ========================== LIFECYCLE ==========================
+    def start(self):
+        """ Starts the worker threads """
+        with self._condition:
+            if self.running:
+                return
+            self.running = True
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._worker, name=f"TaskWorker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        """ Wakes and stops every worker; queued tasks stay queued """
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+
+    # ========================== SUBMISSION & CONTROL ==========================
+    def submit(self, payload, priority=5, deadline=None):
+        """ Queues a task and returns its id; `deadline` is seconds from now """
+        with self._condition:
+            task_id = next(self._ids)
+            expires = time.monotonic() + deadline if deadline is not None else None
+            task = ScheduledTask(task_id, payload, priority, expires)
+            self._tasks[task_id] = task
+            heapq.heappush(self._heap, (priority, next(self._sequence), task))
+            self._counters["submitted"] += 1
+            self._queued_count += 1
+            self._condition.notify()
+        return task_id
+
+    def cancel(self, task_id):
+        """ Cancels a queued task; running or finished tasks are left alone """
+        with self._condition:
+            task = self._tasks.get(task_id)
+            if task is None or task.status != "queued":
+                return False
+            # Lazily skipped by the workers when popped
+            self._queued_count -= 1
+            self._finish(task, "cancelled")
+            return True
+
+    def result(self, task_id):
+        """ Returns the state and result of a task, or None if unknown """
+        with self._condition:
+            task = self._tasks.get(task_id)
+            return task.to_dict() if task else None
+
+    def metrics(self):
+        """ Returns queue depth and throughput counters for sizing the pool """
+        with self._condition:
+            done = self._counters["completed"] + self._counters["failed"]
+            return {
+                "workers": self.num_workers,
+                "queue_depth": self._queued_count,
+                "running": self._running_count,
+                **self._counters,
+                "avg_wait_ms": round(self._total_wait / done * 1000, 2) if done else 0.0,
+                "avg_run_ms": round(self._total_run / done * 1000, 2) if done else 0.0,
+            }
+
+    # ========================== WORKERS ==========================
+    def _next_task(self):
+        """ Blocks until a runnable task is available or the scheduler stops """
+        with self._condition:
+            while True:
+                while self.running and not self._heap:
+                    self._condition.wait()
+                if not self.running:
+                    return None
+                _, _, task = heapq.heappop(self._heap)
+                if task.status != "queued":
+                    continue  # Cancelled while waiting
+                self._queued_count -= 1
+                if task.deadline is not None and time.monotonic() > task.deadline:
+                    self._finish(task, "expired")
+                    continue
+                task.status = "running"
+                task.started = time.monotonic()
+                self._running_count += 1
+                return task
+
+    def _worker(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            try:
+                result, status = self.handler(task.payload), "completed"
+            except Exception as e:
+                result, status = f"❌ Task failed: {e}", "failed"
+            with self._condition:
+                self._running_count -= 1
+                task.result = result
+                self._total_wait += task.started - task.submitted
+                self._total_run += time.monotonic() - task.started
+                self._finish(task, status)
+
+    def _finish(self, task, status):
+        """ Records a terminal state and trims old finished tasks (caller holds the lock) """
+        task.status = status
+        task.finished = time.monotonic()
+        self._counters[status] += 1
+        self._finished.append(task.task_id)
+        while len(self._finished) > self.max_finished:
+            self._tasks.pop(self._finished.popleft(), None)
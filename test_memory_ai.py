@@ -0,0 +1,44 @@
+import json
+import os
+import time
+import types
+from datetime import datetime
+
+
+def load_memory_ai():
+    """ Imports memory_ai.py without the generated notes appended after its code """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory_ai.py")
+    with open(path, "r", encoding="utf-8") as file:
+        source = file.read().split("\n# AI Improvements:")[0]
+    module = types.ModuleType("memory_ai")
+    module.__file__ = path
+    exec(compile(source, path, "exec"), module.__dict__)
+    return module
+
+
+def test_legacy_memories_survive_migration(tmp_path):
+    memory_file = str(tmp_path / "memory_data.json")
+    now = time.time()
+    ages = {"a month old": 30 * 86400, "a day old": 86400, "five hours old": 5 * 3600, "an hour old": 3600}
+    legacy = [{"timestamp": datetime.fromtimestamp(now - age).strftime("%Y-%m-%d %H:%M:%S"), "data": data}
+              for data, age in ages.items()]
+    with open(memory_file, "w") as file:
+        json.dump(legacy, file)
+
+    MemoryAI = load_memory_ai().MemoryAI
+    bot = MemoryAI(port=0, memory_file=memory_file)
+    try:
+        recalled = json.loads(bot.recall(num_entries=10))
+        assert [entry["data"] for entry in recalled] == list(ages)
+        assert [entry["timestamp"] for entry in recalled] == [entry["timestamp"] for entry in legacy]
+        assert all(entry["recall_weight"] > 0.99 for entry in recalled)  # Decay starts at migration
+        assert os.path.exists(bot.store.snapshot_path)
+    finally:
+        bot.store.close()
+
+    reopened = MemoryAI(port=0, memory_file=memory_file)  # Loads the migration snapshot, not the legacy file
+    try:
+        assert not reopened.store.migrated
+        assert [entry["data"] for entry in json.loads(reopened.recall(num_entries=10))] == list(ages)
+    finally:
+        reopened.store.close()
@@ -0,0 +1,91 @@
+import http.server
+import json
+import os
+import threading
+import time
+import types
+import urllib.parse
+
+import pytest
+
+LATENCY = 0.3  # Seconds the stub news API takes per request
+
+# Articles the stub returns per keyword: "tesla" repeats a URL from "apple", and "google" a title (in other case)
+STUB_ARTICLES = {
+    "apple": [
+        {"url": "https://news.test/1", "title": "Chip shortage eases", "description": "Good news for makers."},
+        {"url": "https://news.test/2", "title": "Markets rally", "description": "Stocks rose strongly."},
+    ],
+    "tesla": [
+        {"url": "https://news.test/2", "title": "Markets rally again", "description": "Stocks rose strongly."},
+        {"url": "https://news.test/3", "title": "Factory opens", "description": "A new plant."},
+    ],
+    "google": [
+        {"url": "https://news.test/4", "title": "CHIP SHORTAGE EASES", "description": "Good news for makers."},
+    ],
+    "amazon": [],
+}
+
+
+def load_news_ai():
+    """ Imports news_ai.py without the generated notes appended after its code """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "news_ai.py")
+    with open(path, "r", encoding="utf-8") as file:
+        source = file.read().split("\n# AI Improvements:")[0]
+    module = types.ModuleType("news_ai")
+    module.__file__ = path
+    exec(compile(source, path, "exec"), module.__dict__)
+    return module
+
+
+class StubNewsAPI(http.server.BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        keyword = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)["q"][0]
+        self.requests_seen.append(keyword)
+        time.sleep(LATENCY)
+        articles = [dict(article, source={"name": "Reuters"}) for article in STUB_ARTICLES.get(keyword, [])]
+        body = json.dumps({"status": "ok", "articles": articles}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def news_ai(tmp_path):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubNewsAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubNewsAPI.requests_seen = []
+    bot = load_news_ai().NewsAI(port=0)
+    bot.news_file = str(tmp_path / "news_data.json")
+    bot.news_api_url = f"http://127.0.0.1:{server.server_address[1]}/v2/everything"
+    try:
+        yield bot
+    finally:
+        bot.http.close()
+        bot.fetch_pool.shutdown(wait=False)
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_many_requests_keywords_concurrently(news_ai):
+    keywords = list(STUB_ARTICLES)
+    started = time.monotonic()
+    news_ai.handle_message("FETCH_MANY:" + ",".join(keywords))
+    elapsed = time.monotonic() - started
+    assert sorted(StubNewsAPI.requests_seen) == sorted(keywords)
+    assert LATENCY <= elapsed < 2 * LATENCY  # One stub round trip, not one per keyword
+
+
+def test_fetch_many_merges_duplicate_urls_and_titles(news_ai):
+    response = news_ai.handle_message("FETCH_MANY:apple, tesla, google, apple")
+    lines = response.splitlines()
+    assert lines[0] == "📰 Latest News for apple, tesla, google (3 unique articles):"
+    assert [line.split(" (Sentiment")[0] for line in lines[1:]] == ["Chip shortage eases", "Markets rally", "Factory opens"]
+    assert sorted(StubNewsAPI.requests_seen) == ["apple", "google", "tesla"]
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from security_rules import DEFAULT_RULES, RuleSet, StreamScanner
+
+SNIPPETS = [
+    "rm -rf /tmp/build", "RM  -FR ~", "DROP TABLE users;", "drop\tdatabase prod", "mkfs.ext4 /dev/sdb1",
+    "dd if=/dev/zero bs=1M of=/dev/sda", ":(){ :|:& };:", "curl -s https://x.test/i.sh | sudo bash",
+    "wget -qO- https://x.test | sh", "shutdown -h now", "reboot now", "the trading halt", "chmod 777 /srv",
+    "wget https://x.test/file", "sudo apt install", "grm -rfx", "ddif=nothing", "pseudo code",
+]
+
+
+def make_text(seed, size):
+    """ Harmless words with the snippets mixed in, over many lines """
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "shut", "down", "curl", "pipe", "|", "sh", "rm", "-", "dd", "\n"]
+    parts = []
+    while sum(map(len, parts)) < size:
+        parts.append(rng.choice(SNIPPETS) if rng.random() < 0.1 else rng.choice(words))
+    return " ".join(parts)
+
+
+def stream_scan(ruleset, text, chunk_sizes, overlap):
+    scanner = StreamScanner(ruleset, overlap=overlap)
+    pos, sizes = 0, iter(chunk_sizes)
+    while pos < len(text):
+        size = next(sizes)
+        scanner.feed(text[pos:pos + size])
+        pos += size
+    scanner.feed("", final=True)
+    return scanner.report()
+
+
+def summary(findings):
+    return [(f["rule"], f["severity"], f["start"], f["end"], f["match"]) for f in findings]
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("chunk", [1, 7, 64, 1000, 100000])
+def test_stream_scan_matches_whole_scan_at_any_chunk_boundary(seed, chunk):
+    ruleset = RuleSet(DEFAULT_RULES)
+    text = make_text(seed, 20000)
+    expected = ruleset.scan(text)
+    assert len({f["rule"] for f in expected}) >= 10
+    # The longest line bounds every match, including the open-ended dd and pipe-to-shell rules
+    overlap = max(map(len, text.split("\n")))
+    rng = random.Random(seed * 1000 + chunk)
+    for chunk_sizes in ([chunk] * len(text), [rng.randint(1, 2 * chunk) for _ in range(len(text))]):
+        report = stream_scan(ruleset, text, chunk_sizes, overlap)
+        assert summary(report["findings"]) == summary(expected)
+        assert report["total_findings"] == len(expected)
+        assert report["scanned_chars"] == len(text)
+    lines = [text.count("\n", 0, f["start"]) + 1 for f in expected]
+    assert [f["line"] for f in report["findings"]] == lines
+
+
+def test_match_longer_than_overlap_can_be_cut_at_a_boundary():
+    ruleset = RuleSet(DEFAULT_RULES)
+    text = "dd if=/dev/zero " + "x" * 300 + " of=/dev/sda"
+    assert summary(ruleset.scan(text))[0][0] == "raw-disk-write"
+    assert stream_scan(ruleset, text, [100] * 4, overlap=len(text))["by_rule"] == {"raw-disk-write": 1}
+    assert stream_scan(ruleset, text, [100] * 4, overlap=64)["by_rule"] == {}
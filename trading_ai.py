@@ -1,19 +1,37 @@
-import socket
 import json
-import requests
+import math
 import threading
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from connection_pool import default_pool
+from http_session import DEFAULT_TIMEOUT, make_session
+from response_cache import ResponseCache
+from quote_history import QuoteHistory
+from indicators import IndicatorEngine
+from async_server import AsyncBotServer
 
-class TradingAI:
+class TradingAI(AsyncBotServer):
     def __init__(self, host='localhost', port=7081):  # Fixed Port
         self.host = host
         self.port = port
         self.stock_data = {}
         self.api_key = "YOUR_FINANCIAL_API_KEY"
+        self.quote_api_url = "https://financialmodelingprep.com/api/v3/quote/"
+        self.batch_chunk_size = 100  # Symbols per multi-symbol quote request
+        self.fetch_workers = 8  # Chunks requested at once
+        self.http = make_session(pool_size=self.fetch_workers)
+        self.fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="QuoteFetch")
+        self.report_deadline = 3.0  # Seconds a report waits for its slowest signal source
+        self.report_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ReportSource")
         self.running = True
         self.lock = threading.Lock()
+        self.cache = ResponseCache(max_entries=4096, ttl=5.0)  # Quotes go stale quickly
+        self.history = QuoteHistory("/workspace/ai_project/quote_history", depth=10000)  # Ticks kept per symbol
+        self.indicators = IndicatorEngine()
+        self.indicator_warmup = 300  # Stored ticks replayed when a symbol is first tracked
+        self.tick_lock = threading.Lock()  # Keeps history appends and indicator updates in the same order
 
         # ✅ Updated Neural Bots Port Mapping
         self.neural_bots = {
@@ -33,57 +51,230 @@ class TradingAI:
     # ========================== STOCK DATA FETCHING ==========================
     def fetch_stock_data(self, symbol):
         """ Fetches live stock data from financial API """
-        url = f"https://financialmodelingprep.com/api/v3/quote/{symbol}?apikey={self.api_key}"
         try:
-            response = requests.get(url)
-            data = response.json()
-            if data:
-                stock_info = data[0]
-                stock_entry = {
-                    "symbol": stock_info["symbol"],
-                    "price": stock_info["price"],
-                    "change": stock_info["change"],
-                    "percent_change": stock_info["changesPercentage"],
-                    "volume": stock_info["volume"],
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
+            stock_info = self.cache.get_or_load(("quote", symbol.upper()), lambda: self._request_quote(symbol))
+            if stock_info:
                 with self.lock:
-                    self.stock_data[symbol] = stock_entry
-                return f"📈 {symbol} | ${stock_info['price']} | {stock_info['percent_change']}% change"
+                    self.stock_data[symbol.upper()] = self._stock_entry(stock_info)
+                self.record_ticks([self._tick(symbol, stock_info)])
+                return f"📈 {symbol} | ${stock_info['price']} | {stock_info['changesPercentage']}% change"
             else:
                 return "⚠️ No stock data found."
         except Exception as e:
             return f"❌ Stock API Error: {e}"
 
+    def fetch_batch(self, symbols):
+        """ Refreshes many symbols with multi-symbol quote requests, run concurrently in chunks """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        if not symbols:
+            return "⚠️ FETCH_BATCH needs at least one symbol."
+        chunks = [symbols[i:i + self.batch_chunk_size] for i in range(0, len(symbols), self.batch_chunk_size)]
+
+        def fetch(chunk):
+            try:
+                return self._request_quotes(chunk), None
+            except Exception as e:
+                return [], e
+
+        quotes, errors = [], []
+        for chunk, (found, error) in zip(chunks, self.fetch_pool.map(fetch, chunks)):
+            quotes.extend(found)
+            if error is not None:
+                errors.append(f"❌ Stock API Error for {chunk[0]}..{chunk[-1]}: {error}")
+        entries = {quote["symbol"]: self._stock_entry(quote) for quote in quotes}
+        with self.lock:
+            self.stock_data.update(entries)  # One lock acquisition for the whole batch
+        self.record_ticks([self._tick(quote["symbol"], quote) for quote in quotes])
+        for quote in quotes:
+            self.cache.put(("quote", quote["symbol"].upper()), quote)
+
+        lines = [f"📈 {q['symbol']} | ${q['price']} | {q['changesPercentage']}% change" for q in quotes]
+        missing = [s for s in symbols if s not in entries]
+        if missing and len(errors) < len(chunks):
+            lines.append(f"⚠️ No stock data found for: {', '.join(missing)}")
+        return "\n".join([f"📊 Refreshed {len(quotes)}/{len(symbols)} symbols"] + lines + errors)
+
+    @staticmethod
+    def _stock_entry(stock_info):
+        return {
+            "symbol": stock_info["symbol"],
+            "price": stock_info["price"],
+            "change": stock_info["change"],
+            "percent_change": stock_info["changesPercentage"],
+            "volume": stock_info["volume"],
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    @staticmethod
+    def _tick(symbol, stock_info):
+        # The quote's own timestamp lets the history skip ticks served again from the cache
+        tick_time = stock_info.get("timestamp") or time.time()
+        return symbol.upper(), tick_time, stock_info["price"], stock_info["volume"] or 0, stock_info["change"]
+
+    def record_ticks(self, ticks):
+        """ Appends (symbol, timestamp, price, volume, change) ticks to history and updates the indicators """
+        with self.tick_lock:
+            fresh = [tick for tick in ticks if self.history.append(*tick)]
+            new = [tick[0] for tick in fresh if not self.indicators.tracked(tick[0])]
+            self._warm_indicators(new)  # Their history already ends with the new tick
+            tracked = [tick for tick in fresh if tick[0] not in set(new)]
+            if tracked:
+                self.indicators.update([t[0] for t in tracked], [t[2] for t in tracked], [t[3] for t in tracked])
+
+    def _warm_indicators(self, symbols):
+        series = [self.history.range(symbol)[-self.indicator_warmup:] for symbol in symbols]
+        self.indicators.warm(symbols, [s["price"] for s in series], [s["volume"] for s in series])
+
+    def indicator_values(self, symbols):
+        """ Latest indicators per symbol (None where there is no history yet) """
+        symbols = [symbol.strip().upper() for symbol in symbols if symbol.strip()]
+        with self.tick_lock:
+            untracked = [s for s in dict.fromkeys(symbols) if not self.indicators.tracked(s)]
+            self._warm_indicators([s for s in untracked if self.history.range(s) is not None])
+        values = self.indicators.values(symbols)
+        results = {}
+        for i, symbol in enumerate(symbols):
+            if math.isnan(values["samples"][i]):
+                results[symbol] = None
+            else:
+                results[symbol] = {name: (None if math.isnan(array[i]) else round(float(array[i]), 4))
+                                   for name, array in values.items()}
+        return results
+
+    def _request_quote(self, symbol):
+        """ One upstream quote lookup; None when the API knows no such symbol """
+        data = self._request_quotes([symbol])
+        return data[0] if data else None
+
+    def _request_quotes(self, symbols):
+        """ Quotes for up to batch_chunk_size symbols in one request (the endpoint takes a comma-separated list) """
+        response = self.http.get(self.quote_api_url + ",".join(symbols), params={"apikey": self.api_key}, timeout=DEFAULT_TIMEOUT)
+        response.raise_for_status()
+        return response.json() or []
+
     def recall_stock_data(self, symbol):
         """ Retrieves latest stored stock data """
         with self.lock:
-            if symbol in self.stock_data:
-                return json.dumps(self.stock_data[symbol], indent=4)
+            if symbol.upper() in self.stock_data:
+                return json.dumps(self.stock_data[symbol.upper()], indent=4)
             return "🛑 No data available for this stock."
 
+    def recall_history(self, spec):
+        """ HISTORY:SYMBOL[:start[:end]] with epoch seconds or YYYY-MM-DD dates (end dates are inclusive)
+
+        Returns columns rather than one object per tick.
+        """
+        symbol, _, bounds = spec.partition(":")
+        start, _, end = bounds.partition(":")
+        try:
+            start = self._parse_time(start, end_of_day=False)
+            end = self._parse_time(end, end_of_day=True)
+            ticks = self.history.range(symbol.strip(), start, end)
+        except ValueError as e:
+            return f"⚠️ Invalid HISTORY request: {e}"
+        if ticks is None:
+            return "🛑 No history available for this stock."
+        columns = {name: ticks[name].tolist() for name in ticks.dtype.names}
+        return json.dumps({"symbol": symbol.strip().upper(), "count": len(ticks), **columns})
+
+    @staticmethod
+    def _parse_time(value, end_of_day):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            day = datetime.strptime(value, "%Y-%m-%d").timestamp()
+            return day + 86399.999 if end_of_day else day
+
     # ========================== STOCK MARKET ANALYSIS ==========================
     def generate_market_report(self, symbol):
         """ Generates a smart trading alert based on multiple AI signals """
-        stock_info = self.recall_stock_data(symbol)
-        sentiment = self.send_message("news_ai", f"ANALYZE_SENTIMENT:{symbol}")
-        chart_patterns = self.send_message("logic_ai", f"ANALYZE_TRENDS:{symbol}")
+        symbol = symbol.strip().upper()
+        signals, sources = self.gather_signals([symbol])
+        signals = signals[symbol]
+        stock_info = json.dumps(signals["quote"], indent=4) if signals.get("quote") else "🛑 No data available for this stock."
+        sentiment = signals.get("news_sentiment")
+        sentiment = json.dumps(sentiment) if sentiment else "⚠️ News sentiment unavailable."
+        indicators = signals.get("technicals")
+        technicals = json.dumps(indicators, indent=4) if indicators else "🛑 No price history for technical indicators."
+        status = " | ".join(
+            f"{name} ✅ {info['ms']}ms" if info["status"] == "ok" else f"{name} ⚠️ {info['status']}"
+            for name, info in sources.items()
+        )
+        return f"📊 Market Report for {symbol}\n{stock_info}\n{sentiment}\n{technicals}\n🛰️ Sources: {status}"
+
+    def analyze_batch(self, symbols):
+        """ Market signals for many symbols as JSON, each source queried once for the whole batch """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        if not symbols:
+            return "⚠️ ANALYZE_BATCH needs at least one symbol."
+        signals, sources = self.gather_signals(symbols)
+        return json.dumps({"symbols": signals, "sources": sources}, indent=4)
+
+    def gather_signals(self, symbols, deadline=None):
+        """ Scatter-gather: queries every signal source concurrently under one overall deadline
+
+        Returns ({symbol: {source: value}}, {source: status}). A source that
+        fails or misses the deadline is reported in the status and left out of
+        the signals, so a slow bot only costs its own section of the report.
+        """
+        deadline = self.report_deadline if deadline is None else deadline
 
-        return f"📊 Market Report for {symbol}\n{stock_info}\n{sentiment}\n{chart_patterns}"
+        def timed(source):
+            started = time.monotonic()
+            return source(), round((time.monotonic() - started) * 1000, 2)
+
+        # Sockets get a little longer than the deadline: a slow bot is reported as a timeout,
+        # and its worker is still released soon after
+        futures = {name: self.report_pool.submit(timed, source)
+                   for name, source in self._signal_sources(symbols, deadline + 1.0).items()}
+        done, _ = wait(futures.values(), timeout=deadline)
+        signals = {symbol: {} for symbol in symbols}
+        sources = {}
+        for name, future in futures.items():
+            if future not in done:
+                future.cancel()
+                sources[name] = {"status": "timeout"}
+                continue
+            try:
+                values, elapsed = future.result()
+            except Exception as e:
+                sources[name] = {"status": "error", "error": str(e)}
+                continue
+            sources[name] = {"status": "ok", "ms": elapsed}
+            for symbol in symbols:
+                if values.get(symbol) is not None:
+                    signals[symbol][name] = values[symbol]
+        return signals, sources
+
+    def _signal_sources(self, symbols, timeout):
+        """ Source name -> callable returning {symbol: value}; each makes at most one call for all symbols """
+        return {
+            "quote": lambda: {s: self.stock_data.get(s) for s in symbols},
+            "news_sentiment": lambda: self._news_sentiment(symbols, timeout),
+            "technicals": lambda: self.indicator_values(symbols),
+        }
+
+    def _news_sentiment(self, symbols, timeout):
+        """ Aggregated sentiment of the stored articles that mention each symbol """
+        reply = self.send_message("news_ai", "SENTIMENT_SUMMARY:" + json.dumps(symbols), timeout=timeout)
+        try:
+            summaries = json.loads(reply)
+        except ValueError:
+            raise RuntimeError(reply)
+        return dict(zip(symbols, summaries))
 
     # ========================== NETWORK COMMUNICATION ==========================
-    def send_message(self, target_bot, message):
+    def send_message(self, target_bot, message, timeout=None):
         """ Sends a message to another bot within the network """
         if target_bot not in self.neural_bots:
             return f"⚠️ Bot {target_bot} not recognized."
 
         target_port = self.neural_bots[target_bot]
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect(("localhost", target_port))
-                s.sendall(message.encode())
-                response = s.recv(1024).decode()
-                return response
+            return default_pool.request("localhost", target_port, message, timeout=timeout)
         except Exception as e:
             return f"❌ Error communicating with {target_bot}: {e}"
 
@@ -94,39 +285,35 @@ class TradingAI:
         server_thread.start()
         print("\n💹 Trading AI is Active and LISTENING...")
 
-    def _server_loop(self):
-        """ Handles incoming stock data requests via sockets """
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.bind((self.host, self.port))
-            s.listen()
-            while self.running:
-                try:
-                    conn, addr = s.accept()
-                    thread = threading.Thread(target=self.handle_connection, args=(conn,))
-                    thread.start()
-                except Exception as e:
-                    print(f"❌ Server Error: {e}")
-
-    def handle_connection(self, conn):
+    def handle_message(self, message):
         """ Processes stock market queries """
-        try:
-            with conn:
-                message = conn.recv(1024).decode().strip()
-                if message.startswith("FETCH"):
-                    response = self.fetch_stock_data(message.replace("FETCH:", "").strip())
-                elif message.startswith("RECALL"):
-                    response = self.recall_stock_data(message.replace("RECALL:", "").strip())
-                elif message.startswith("ANALYZE"):
-                    response = self.generate_market_report(message.replace("ANALYZE:", "").strip())
-                else:
-                    response = "⚠️ Invalid command. Use FETCH, RECALL, ANALYZE."
-                conn.sendall(response.encode())
-        except Exception as e:
-            print(f"⚠️ Connection Error: {e}")
+        if message.startswith("FETCH_BATCH"):
+            response = self.fetch_batch(message.replace("FETCH_BATCH:", "", 1).split(","))
+        elif message.startswith("FETCH"):
+            response = self.fetch_stock_data(message.replace("FETCH:", "").strip())
+        elif message.startswith("HISTORY"):
+            response = self.recall_history(message.replace("HISTORY:", "", 1))
+        elif message.startswith("INDICATORS"):
+            response = json.dumps(self.indicator_values(message.replace("INDICATORS:", "", 1).split(",")))
+        elif message.startswith("CACHE_STATS"):
+            response = json.dumps(self.cache.stats(), indent=4)
+        elif message.startswith("RECALL"):
+            response = self.recall_stock_data(message.replace("RECALL:", "").strip())
+        elif message.startswith("ANALYZE_BATCH"):
+            response = self.analyze_batch(message.replace("ANALYZE_BATCH:", "", 1).split(","))
+        elif message.startswith("ANALYZE"):
+            response = self.generate_market_report(message.replace("ANALYZE:", "").strip())
+        else:
+            response = "⚠️ Invalid command. Use FETCH, FETCH_BATCH, RECALL, HISTORY, INDICATORS, ANALYZE, ANALYZE_BATCH, CACHE_STATS."
+        return response
 
     def stop(self):
         """ Stops the AI """
         self.running = False
+        self.history.flush()
+        self.fetch_pool.shutdown(wait=False)
+        self.report_pool.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
         print("🛑 Trading AI has been stopped.")
 
 # ========================== TRADING AI INITIALIZATION ==========================
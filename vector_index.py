@@ -0,0 +1,225 @@
+import os
+import zlib
+import numpy as np
+from memory_index import tokenize
+
+
+class HashedEmbedder:
+    """ Local text embeddings from hashed word and character n-grams (no model, no network)
+
+    Each feature is hashed with a stable CRC32 into one of `dim` buckets with a
+    hash-derived sign, then the vector is L2-normalized so a dot product is the
+    cosine similarity. Character n-grams make paraphrases and inflections
+    ("invest", "investing", "investment") land close together.
+    """
+
+    def __init__(self, dim=128, ngram_sizes=(3, 4, 5)):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+
+    def features(self, text):
+        for word in tokenize(text):
+            yield word
+            padded = f" {word} "
+            for size in self.ngram_sizes:
+                for i in range(len(padded) - size + 1):
+                    yield padded[i:i + size]
+
+    def embed(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self.features(text):
+            h = zlib.crc32(feature.encode())
+            vector[h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+def spherical_kmeans(vectors, n_lists, iterations=8, seed=0, rows=None):
+    """ Unit-length k-means centroids trained on a sample of the (unit-length) vectors, or of `rows` of them """
+    rng = np.random.default_rng(seed)
+    population = len(vectors) if rows is None else rows
+    size = len(vectors) if rows is None else len(rows)
+    sample = vectors[rng.choice(population, size=min(size, 64 * n_lists), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        filled = norms[:, 0] > 0
+        centroids[filled] = sums[filled] / norms[filled]  # Spherical k-means keeps centroids unit length
+    return centroids
+
+
+def list_count(size, max_lists=1024):
+    """ Number of IVF lists for `size` vectors: about sqrt(size), at least 16 """
+    return min(max_lists, max(16, int(np.sqrt(size))))
+
+
+class IVFIndex:
+    """ In-process inverted-file (IVF) approximate nearest neighbour index
+
+    Vectors live in one growable float32 matrix; ids are appended in increasing
+    order so an id's row is found with a binary search. Below `train_threshold`
+    vectors, search is exact. Above it, k-means centroids partition the rows into
+    lists and a query only scores the `nprobe` lists closest to it. Centroids are
+    retrained each time the index grows 4x, up to `max_lists` lists.
+    """
+
+    def __init__(self, dim=128, nprobe=16, train_threshold=4096, max_lists=1024):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.max_lists = max_lists
+        self.clear()
+
+    def clear(self):
+        self.vectors = np.zeros((1024, self.dim), dtype=np.float32)
+        self.ids = np.zeros(1024, dtype=np.int64)
+        self.alive = np.zeros(1024, dtype=bool)
+        self.count = 0  # Rows used, including deleted ones
+        self.live = 0
+        self.centroids = None
+        self.lists = []  # Row numbers per centroid
+        self._list_arrays = {}  # Cached NumPy copies of lists, dropped when a list changes
+        self.trained_at = 0
+
+    # ========================== MUTATION ==========================
+    def _row(self, doc_id):
+        row = int(np.searchsorted(self.ids[:self.count], doc_id))
+        return row if row < self.count and self.ids[row] == doc_id else None
+
+    def contains(self, doc_id):
+        row = self._row(doc_id)
+        return row is not None and bool(self.alive[row])
+
+    def vector(self, doc_id):
+        """ Returns the stored vector for a live id, or None """
+        row = self._row(doc_id)
+        return self.vectors[row] if row is not None and self.alive[row] else None
+
+    def add(self, doc_id, vector):
+        if self.count and doc_id <= self.ids[self.count - 1]:
+            if self.contains(doc_id):
+                return
+            raise ValueError("IVFIndex ids must be added in increasing order.")
+        if self.count == len(self.ids):
+            self._grow()
+        row = self.count
+        self.vectors[row] = vector
+        self.ids[row] = doc_id
+        self.alive[row] = True
+        self.count += 1
+        self.live += 1
+        if self.centroids is not None:
+            nearest = int(np.argmax(self.centroids @ vector))
+            self.lists[nearest].append(row)
+            self._list_arrays.pop(nearest, None)
+        if self.live >= max(self.train_threshold, 4 * self.trained_at) and self._list_target() > len(self.lists):
+            self.train()
+
+    def remove(self, doc_id):
+        row = self._row(doc_id)
+        if row is not None and self.alive[row]:
+            self.alive[row] = False  # Tombstone; rows are dropped on the next compaction
+            self.live -= 1
+            if self.count > 2 * self.live + 4096:
+                self.compact()
+
+    def _grow(self):
+        size = len(self.ids) * 2
+        self.vectors = np.resize(self.vectors, (size, self.dim))
+        self.ids = np.resize(self.ids, size)
+        self.alive = np.resize(self.alive, size)
+        self.alive[self.count:] = False
+
+    def compact(self):
+        """ Drops tombstoned rows and renumbers the lists without reassigning vectors """
+        alive = self.alive[:self.count]
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        new_row = np.cumsum(alive) - 1
+        self.lists = [new_row[[row for row in rows if alive[row]]].tolist() for rows in self.lists]
+        self._list_arrays = {}
+        self.vectors = np.ascontiguousarray(self.vectors[keep])
+        self.ids = self.ids[keep].copy()
+        self.alive = np.ones(len(keep), dtype=bool)
+        self.count = self.live = len(keep)
+        if self.count == 0:
+            self.clear()
+
+    # ========================== TRAINING ==========================
+    def _list_target(self):
+        return list_count(self.live, self.max_lists)
+
+    def train(self, iterations=8, seed=0):
+        """ Runs k-means on a sample of live vectors and reassigns every row """
+        rows = np.flatnonzero(self.alive[:self.count])
+        self.centroids = spherical_kmeans(self.vectors, self._list_target(), iterations, seed, rows=rows)
+        self.trained_at = self.live
+        self._assign_lists()
+
+    def _assign_lists(self, chunk=65536):
+        assignment = np.empty(self.count, dtype=np.int64)
+        for start in range(0, self.count, chunk):
+            block = self.vectors[start:start + chunk]
+            assignment[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(len(self.centroids) + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]].tolist() for i in range(len(self.centroids))]
+        self._list_arrays = {}
+
+    def _list_array(self, list_number):
+        rows = self._list_arrays.get(list_number)
+        if rows is None:
+            rows = self._list_arrays[list_number] = np.array(self.lists[list_number], dtype=np.int64)
+        return rows
+
+    # ========================== SEARCH ==========================
+    def search(self, vector, k=10):
+        """ Returns [(id, similarity)] for the k most similar live vectors """
+        if self.live == 0:
+            return []
+        if self.centroids is None:
+            rows = np.arange(self.count)
+        else:
+            probe = min(self.nprobe, len(self.centroids))
+            nearest = np.argpartition(-(self.centroids @ vector), probe - 1)[:probe]
+            rows = np.concatenate([self._list_array(c) for c in nearest])
+        rows = rows[self.alive[rows]]
+        if len(rows) == 0:
+            return []
+        scores = self.vectors[rows] @ vector
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[rows[i]]), float(scores[i])) for i in top]
+
+    # ========================== PERSISTENCE ==========================
+    def save(self, path):
+        """ Writes the live vectors and centroids atomically (path must end in .npz) """
+        self.compact()
+        temp_path = path[:-len(".npz")] + ".tmp.npz"
+        arrays = {"vectors": self.vectors[:self.count], "ids": self.ids[:self.count]}
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+        np.savez(temp_path, **arrays)
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        with np.load(path) as data:
+            if data["vectors"].shape[1] != self.dim:
+                return False
+            self.clear()
+            count = len(data["ids"])
+            if count:
+                self.vectors = data["vectors"].astype(np.float32)
+                self.ids = data["ids"].astype(np.int64)
+                self.alive = np.ones(count, dtype=bool)
+                self.count = self.live = count
+            if "centroids" in data.files and count:
+                self.centroids = data["centroids"]
+                self.trained_at = count
+                self._assign_lists()
+        return True
@@ -0,0 +1,82 @@
+import asyncio
+import struct
+
+# ========================== FRAME FORMAT ==========================
+# Every message between bots is sent as one frame:
+#   4-byte big-endian payload length + UTF-8 payload
+# so replies of any size cross in a single request/response exchange.
+
+HEADER = struct.Struct("!I")
+MAX_FRAME_SIZE = 64 * 1024 * 1024  # Refuse absurd lengths from a corrupt stream
+READ_CHUNK = 64 * 1024
+
+
+class FrameError(ConnectionError):
+    """ Raised when a peer sends a malformed or truncated frame """
+
+
+def encode_frame(message):
+    """ Encodes a text message into a length-prefixed frame """
+    payload = message.encode() if isinstance(message, str) else bytes(message)
+    if len(payload) > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame of {len(payload)} bytes exceeds limit of {MAX_FRAME_SIZE}.")
+    return HEADER.pack(len(payload)) + payload
+
+
+def send_frame(sock, message):
+    """ Sends one framed message over a connected socket """
+    sock.sendall(encode_frame(message))
+
+
+def _recv_exact(sock, size):
+    """ Reads exactly `size` bytes, streaming large payloads in chunks """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], min(size - received, READ_CHUNK))
+        if count == 0:
+            return None if received == 0 else bytes(buffer[:received])
+        received += count
+    return bytes(buffer)
+
+
+def recv_frame(sock):
+    """ Receives one framed message; returns None if the peer closed cleanly """
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    if len(header) < HEADER.size:
+        raise FrameError("Connection closed inside a frame header.")
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame of {size} bytes exceeds limit of {MAX_FRAME_SIZE}.")
+    payload = _recv_exact(sock, size) if size else b""
+    if payload is None or len(payload) < size:
+        raise FrameError("Connection closed inside a frame payload.")
+    return payload.decode()
+
+
+# ========================== ASYNCIO HELPERS ==========================
+async def read_frame(reader):
+    """ Reads one framed message from an asyncio stream; returns None on clean EOF """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise FrameError("Connection closed inside a frame header.") from e
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise FrameError(f"Frame of {size} bytes exceeds limit of {MAX_FRAME_SIZE}.")
+    try:
+        payload = await reader.readexactly(size)
+    except asyncio.IncompleteReadError as e:
+        raise FrameError("Connection closed inside a frame payload.") from e
+    return payload.decode()
+
+
+async def write_frame(writer, message):
+    """ Writes one framed message and waits for the transport buffer to drain """
+    writer.write(encode_frame(message))
+    await writer.drain()